@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Analytic Sensitivity (Gradient) Report for σ_sys,corr and Hubble Tension
+========================================================================
+
+Exact partial derivatives of the correlated systematic budget and the
+Hubble tension with respect to every input, replacing finite ρ grids
+(extended_correlation_sensitivity.py, correlation_uncertainty_sensitivity.py)
+for local sensitivity ranking.
+
+With σ_sys = √(σᵀRσ) and T = |H₀,ceph − H₀,ref| / S,
+S = √(σ_stat² + σ_sys² + σ_ref²):
+
+    ∂σ_sys/∂σ_k   = (Rσ)_k / σ_sys
+    ∂σ_sys/∂ρ_ij  = σ_i σ_j / σ_sys          (symmetric perturbation, i < j)
+    ∂T/∂σ_sys     = −T σ_sys / S²
+    ∂T/∂σ_stat    = −T σ_stat / S²,  ∂T/∂σ_ref = −T σ_ref / S²
+    ∂T/∂H₀,ceph   = sign(ΔH₀) / S,   ∂T/∂H₀,ref = −sign(ΔH₀) / S
+
+All gradients come from one matrix-vector product, so the full ranked
+table for 9–10 sources and 36–45 pairs costs microseconds.
+
+Author: Distance Ladder Systematics Project
+Date: November 2025
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from recalculate_systematic_budget_revised import SIGMA_VECTOR_BASELINE, STAT_UNC
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+# Tension reference values (Scenario A + Prior 1 baseline vs Planck 2018)
+H0_CORRECTED = 69.67  # km/s/Mpc
+H0_PLANCK = 67.36  # km/s/Mpc
+SIGMA_PLANCK = 0.54  # km/s/Mpc
+
+
+def systematic_budget_gradients(sigma_vector, R_matrix):
+    """
+    σ_sys,corr and its exact gradients with respect to σ and R.
+
+    Parameters
+    ----------
+    sigma_vector : array
+        (..., n) individual systematic uncertainties (km/s/Mpc)
+    R_matrix : array
+        (..., n, n) correlation matrix
+
+    Returns
+    -------
+    dict
+        'sigma_sys': σ_sys,corr,
+        'd_sigma': (..., n) ∂σ_sys/∂σ_k,
+        'd_rho': (..., n, n) ∂σ_sys/∂ρ_ij for symmetric perturbations
+        (diagonal set to zero)
+    """
+    sigma_vector = np.asarray(sigma_vector, dtype=float)
+    R_matrix = np.asarray(R_matrix, dtype=float)
+
+    R_sigma = np.einsum('...ij,...j->...i', R_matrix, sigma_vector)
+    sigma_sys = np.sqrt(np.einsum('...i,...i->...', sigma_vector, R_sigma))
+
+    d_sigma = R_sigma / sigma_sys[..., np.newaxis]
+    d_rho = (sigma_vector[..., :, np.newaxis] * sigma_vector[..., np.newaxis, :]
+             / sigma_sys[..., np.newaxis, np.newaxis])
+    n = sigma_vector.shape[-1]
+    d_rho[..., np.arange(n), np.arange(n)] = 0.0
+
+    return {'sigma_sys': sigma_sys, 'd_sigma': d_sigma, 'd_rho': d_rho}
+
+
+def tension_gradients(sigma_sys, H0_cepheid=H0_CORRECTED, sigma_stat=STAT_UNC,
+                      H0_ref=H0_PLANCK, sigma_ref=SIGMA_PLANCK):
+    """
+    Hubble tension and its exact gradients with respect to its inputs.
+
+    Parameters
+    ----------
+    sigma_sys : float or array
+        Correlated systematic uncertainty (km/s/Mpc)
+    H0_cepheid, sigma_stat, H0_ref, sigma_ref : float or array
+        Corrected Cepheid H₀, its statistical error, and the reference H₀
+        with its uncertainty (km/s/Mpc)
+
+    Returns
+    -------
+    dict
+        'tension' plus ∂T/∂ for 'sigma_sys', 'H0_cepheid', 'sigma_stat',
+        'H0_ref' and 'sigma_ref'
+    """
+    S_sq = sigma_stat**2 + np.asarray(sigma_sys)**2 + sigma_ref**2
+    S = np.sqrt(S_sq)
+    delta = H0_cepheid - H0_ref
+    tension = np.abs(delta) / S
+
+    return {
+        'tension': tension,
+        'sigma_sys': -tension * sigma_sys / S_sq,
+        'H0_cepheid': np.sign(delta) / S,
+        'sigma_stat': -tension * sigma_stat / S_sq,
+        'H0_ref': -np.sign(delta) / S,
+        'sigma_ref': -tension * sigma_ref / S_sq
+    }
+
+
+def sensitivity_table(sigma_vector, R_matrix, source_names, **tension_inputs):
+    """
+    Ranked sensitivity table for all sources, pairs and tension inputs.
+
+    Parameters
+    ----------
+    sigma_vector : array
+        (n,) individual systematic uncertainties (km/s/Mpc)
+    R_matrix : array
+        (n, n) correlation matrix
+    source_names : list of str
+        Names of the n systematic sources
+    **tension_inputs
+        Overrides for tension_gradients (H0_cepheid, sigma_stat, ...)
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per input with its value, ∂σ_sys/∂x, ∂T/∂x and the rank
+        by |∂T/∂x| (1 = most influential)
+    """
+    sigma_vector = np.asarray(sigma_vector, dtype=float)
+    R_matrix = np.asarray(R_matrix, dtype=float)
+
+    budget = systematic_budget_gradients(sigma_vector, R_matrix)
+    tension = tension_gradients(budget['sigma_sys'], **tension_inputs)
+    dT_dsys = tension['sigma_sys']
+
+    iu, ju = np.triu_indices(len(sigma_vector), k=1)
+    pair_names = [f'{source_names[i]} ↔ {source_names[j]}' for i, j in zip(iu, ju)]
+
+    tension_keys = ['H0_cepheid', 'sigma_stat', 'H0_ref', 'sigma_ref']
+    defaults = {'H0_cepheid': H0_CORRECTED, 'sigma_stat': STAT_UNC,
+                'H0_ref': H0_PLANCK, 'sigma_ref': SIGMA_PLANCK}
+    defaults.update(tension_inputs)
+
+    table = pd.concat([
+        pd.DataFrame({
+            'parameter': [f'σ[{name}]' for name in source_names],
+            'type': 'sigma_component',
+            'value': sigma_vector,
+            'd_sigma_sys': budget['d_sigma'],
+            'd_tension': dT_dsys * budget['d_sigma']
+        }),
+        pd.DataFrame({
+            'parameter': [f'ρ[{name}]' for name in pair_names],
+            'type': 'correlation',
+            'value': R_matrix[iu, ju],
+            'd_sigma_sys': budget['d_rho'][iu, ju],
+            'd_tension': dT_dsys * budget['d_rho'][iu, ju]
+        }),
+        pd.DataFrame({
+            'parameter': tension_keys,
+            'type': 'tension_input',
+            'value': [defaults[k] for k in tension_keys],
+            'd_sigma_sys': 0.0,
+            'd_tension': [tension[k] for k in tension_keys]
+        })
+    ], ignore_index=True)
+
+    table['rank'] = table['d_tension'].abs().rank(ascending=False, method='min').astype(int)
+    return table.sort_values('rank').reset_index(drop=True)
+
+
+def main():
+    print("=" * 80)
+    print("ANALYTIC SENSITIVITY REPORT: σ_sys,corr AND HUBBLE TENSION")
+    print("=" * 80)
+    print()
+
+    R = pd.read_csv(DATA_DIR / "correlation_matrix_updated.csv", index_col=0)
+    sources = list(SIGMA_VECTOR_BASELINE.keys())
+    sigma_vec = np.array([SIGMA_VECTOR_BASELINE[s] for s in sources])
+    R_matrix = R.loc[sources, sources].values
+
+    budget = systematic_budget_gradients(sigma_vec, R_matrix)
+    tension = tension_gradients(budget['sigma_sys'])
+
+    print(f"σ_sys,corr = {budget['sigma_sys']:.3f} km/s/Mpc")
+    print(f"Tension    = {tension['tension']:.3f}σ (corrected Cepheid vs Planck)")
+    print()
+
+    table = sensitivity_table(sigma_vec, R_matrix, sources)
+
+    print("Top 15 inputs ranked by |∂T/∂x|:")
+    print("-" * 80)
+    print(table.head(15).to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+    print("-" * 80)
+    print()
+
+    # Finite-difference cross-check on the largest correlation pair
+    top_pair = table[table['type'] == 'correlation'].iloc[0]
+    i, j = [sources.index(name) for name in top_pair['parameter'][2:-1].split(' ↔ ')]
+    step = 1e-6
+    R_step = R_matrix.copy()
+    R_step[i, j] += step
+    R_step[j, i] += step
+    finite_diff = (np.sqrt(sigma_vec @ R_step @ sigma_vec) - budget['sigma_sys']) / step
+    print(f"Check {top_pair['parameter']}: analytic ∂σ_sys/∂ρ = {top_pair['d_sigma_sys']:.6f}, "
+          f"finite difference = {finite_diff:.6f}")
+    print()
+
+    output_file = DATA_DIR / "analytic_sensitivity.csv"
+    table.to_csv(output_file, index=False)
+    print(f"Results saved: {output_file}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Batched Bootstrap for Random-Effects Fits
+=========================================
+
+Parametric and nonparametric bootstrap for the Gaussian random-effects
+fits y ~ N(θ·x, s² + τ²): (H₀, σ_int) for cosmic-chronometer H(z) data
+and (μ, τ) for JWST galaxy-level offsets.
+
+All B replicate datasets are generated as one (B, n) array and refitted
+together with the vectorized profile solver (closed_form_fits.
+profile_scatter_fit) instead of B optimizer calls. Intervals are reported
+as bootstrap percentile and BCa (bias-corrected and accelerated, with the
+acceleration from a batched jackknife).
+
+B = 10⁵ replicates of the 15-galaxy or 32-point sets take 1-2 seconds.
+
+References:
+    - Efron 1987, JASA 82, 171 (BCa intervals)
+    - Efron & Tibshirani 1993, An Introduction to the Bootstrap
+
+Author: Distance Ladder Systematics Analysis
+Date: 2025-11-29
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from closed_form_fits import profile_scatter_fit, scatter_search_bounds
+
+BOOTSTRAP_KINDS = ('parametric', 'nonparametric')
+
+
+def simulate_parametric(x, s, theta, tau, n_boot, rng=None):
+    """
+    Replicate datasets from the fitted model.
+
+    Returns
+    -------
+    ndarray
+        (n_boot, n) simulated observations θ·x + N(0, s² + τ²)
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    return theta * x + np.sqrt(s**2 + tau**2) * rng.standard_normal((n_boot, len(s)))
+
+
+def resample_nonparametric(y, x, s, n_boot, rng=None):
+    """
+    Case-resampled datasets (rows drawn with replacement).
+
+    Returns
+    -------
+    tuple of ndarray
+        (n_boot, n) resampled y, x and s
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    index = rng.integers(len(y), size=(n_boot, len(y)))
+    return y[index], x[index], s[index]
+
+
+def jackknife_fits(y, x, s, **fit_kwargs):
+    """
+    Leave-one-out refits, all n in one batched call.
+
+    Returns
+    -------
+    dict
+        (n,) 'theta' and 'tau' jackknife estimates
+    """
+    n = len(y)
+    keep = ~np.eye(n, dtype=bool)
+    return profile_scatter_fit(y[np.newaxis].repeat(n, 0)[keep].reshape(n, n - 1),
+                               x[np.newaxis].repeat(n, 0)[keep].reshape(n, n - 1),
+                               s[np.newaxis].repeat(n, 0)[keep].reshape(n, n - 1),
+                               **fit_kwargs)
+
+
+def percentile_interval(replicates, level=0.68):
+    """Bootstrap percentile interval."""
+    alpha = 0.5 * (1 - level)
+    return tuple(np.percentile(replicates, [100 * alpha, 100 * (1 - alpha)]))
+
+
+def bca_interval(replicates, estimate, jackknife, level=0.68):
+    """
+    Bias-corrected and accelerated bootstrap interval.
+
+    Parameters
+    ----------
+    replicates : array
+        (B,) bootstrap estimates
+    estimate : float
+        Estimate on the original data
+    jackknife : array
+        (n,) leave-one-out estimates (for the acceleration)
+    level : float
+        Confidence level
+
+    Returns
+    -------
+    tuple
+        (lower, upper); falls back to the percentile interval when the
+        bias correction is undefined (no replicates below or above the
+        estimate, e.g. τ̂ = 0 on the boundary)
+    """
+    below = np.mean(replicates < estimate)
+    if below <= 0 or below >= 1:
+        return percentile_interval(replicates, level)
+    z0 = stats.norm.ppf(below)
+
+    deviations = jackknife.mean() - jackknife
+    denominator = 6.0 * np.sum(deviations**2)**1.5
+    acceleration = np.sum(deviations**3) / denominator if denominator > 0 else 0.0
+
+    alpha = 0.5 * (1 - level)
+    z = stats.norm.ppf([alpha, 1 - alpha])
+    adjusted = stats.norm.cdf(z0 + (z0 + z) / (1 - acceleration * (z0 + z)))
+    return tuple(np.percentile(replicates, 100 * adjusted))
+
+
+def bootstrap_random_effects(y, x, s, n_boot=10_000, kind='parametric', levels=(0.68, 0.95),
+                             rng=None, names=('theta', 'tau'), **fit_kwargs):
+    """
+    Bootstrap uncertainties for (θ, τ) of y ~ N(θ·x, s² + τ²).
+
+    Parameters
+    ----------
+    y, x, s : array
+        (n,) observations, design values and measurement errors
+    n_boot : int
+        Number of bootstrap replicates
+    kind : str
+        'parametric' (simulate from the fitted model) or 'nonparametric'
+        (resample cases)
+    levels : tuple of float
+        Confidence levels for the intervals
+    rng : np.random.Generator, optional
+        Random generator
+    names : (str, str)
+        Labels for θ and τ in the output (e.g. ('H0', 'sigma_int'))
+    **fit_kwargs
+        Passed to profile_scatter_fit
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per parameter: estimate, bootstrap mean and SE, and
+        percentile/BCa interval bounds per level
+    dict
+        (B,) bootstrap replicates per parameter
+    """
+    if kind not in BOOTSTRAP_KINDS:
+        raise ValueError(f"Unknown bootstrap kind '{kind}' (choose from {BOOTSTRAP_KINDS})")
+    rng = np.random.default_rng() if rng is None else rng
+    y, x, s = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (y, x, s)))
+    fit_kwargs.setdefault('tau_bounds', scatter_search_bounds(y, x, s))
+
+    fit = profile_scatter_fit(y, x, s, **fit_kwargs)
+    if kind == 'parametric':
+        y_boot = simulate_parametric(x, s, fit['theta'], fit['tau'], n_boot, rng)
+        boot = profile_scatter_fit(y_boot, x, s, **fit_kwargs)
+    else:
+        boot = profile_scatter_fit(*resample_nonparametric(y, x, s, n_boot, rng), **fit_kwargs)
+    jack = jackknife_fits(y, x, s, **fit_kwargs)
+
+    rows = []
+    replicates = {}
+    for key, name in zip(('theta', 'tau'), names):
+        estimate = float(fit[key])
+        row = {'parameter': name, 'estimate': estimate,
+               'boot_mean': boot[key].mean(), 'boot_se': boot[key].std(ddof=1)}
+        for level in levels:
+            tag = f'{int(round(100 * level))}'
+            row[f'pct{tag}_lower'], row[f'pct{tag}_upper'] = percentile_interval(boot[key], level)
+            row[f'bca{tag}_lower'], row[f'bca{tag}_upper'] = bca_interval(
+                boot[key], estimate, jack[key], level)
+        rows.append(row)
+        replicates[name] = boot[key]
+
+    return pd.DataFrame(rows), replicates
+
+
+def main():
+    import time
+
+    from hierarchical_hz_fit import load_cosmic_chronometer_data
+    from jwst_random_effects_crossval import simulate_cepheid_vs_trgb
+
+    print("=" * 80)
+    print("BATCHED BOOTSTRAP - COSMIC CHRONOMETERS AND JWST CEPHEID-TRGB")
+    print("=" * 80)
+    print()
+
+    n_boot = 100_000
+    rng = np.random.default_rng(2025)
+
+    cc_model = load_cosmic_chronometer_data()
+    cepheid_model = simulate_cepheid_vs_trgb()
+
+    for label, model in (("Cosmic chronometers", cc_model), ("Cepheid vs TRGB", cepheid_model)):
+        for kind in BOOTSTRAP_KINDS:
+            start = time.perf_counter()
+            summary, _ = model.bootstrap(n_boot=n_boot, kind=kind, rng=rng)
+            elapsed = time.perf_counter() - start
+
+            print(f"{label} ({len(model)} points), {kind}, B = {n_boot:,}: {elapsed:.2f} s")
+            for _, row in summary.iterrows():
+                print(f"  {row['parameter']:>10s} = {row['estimate']:.4f} ± {row['boot_se']:.4f}  "
+                      f"68% pct [{row['pct68_lower']:.4f}, {row['pct68_upper']:.4f}]  "
+                      f"BCa [{row['bca68_lower']:.4f}, {row['bca68_upper']:.4f}]")
+            print()
+
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,12 @@ import seaborn as sns
 from scipy import stats
 from pathlib import Path
 
+from correlation_matrix_validation import validate_and_repair
+from parallel_sampling import merge_streaming_summaries, run_sharded
+from qmc_sampling import UnitSampler, convergence_report, scaled_beta_ppf
+from sample_store import SampleStore
+from streaming_statistics import SUMMARY_PERCENTILES, StreamingSummary
+
 # Set plotting style
 sns.set_style('whitegrid')
 sns.set_context('paper')
@@ -203,7 +209,206 @@ def sensitivity_analysis_correlation_variation():
     return results_df, sigma_baseline
 
 
-def monte_carlo_correlation_uncertainty(n_samples=10000):
+# Systematic uncertainties held fixed in the Monte Carlo (km/s/Mpc)
+MC_SIGMA = np.array([1.0, 1.0, 1.0, 1.5, 0.5, 0.3, 0.3, 0.5, 0.4, 0.3])
+
+# Prior distributions for key correlations (informative, not uniform).
+# Each entry is (i, j, α, β, lower, width): ρ_ij = lower + width · Beta(α, β)
+MC_CORRELATION_PRIORS = [
+    (3, 7, 5, 3, 0.3, 0.4),  # ρ(crowding, reddening)
+    (2, 7, 4, 6, 0.1, 0.4),  # ρ(metallicity, reddening)
+    (1, 2, 3, 5, 0.0, 0.4),  # ρ(period, metallicity)
+]
+
+
+def mc_fixed_correlation_matrix():
+    """
+    Correlation matrix with the perturbed pairs zeroed and the fixed
+    minor correlations (from baseline) filled in.
+
+    Returns
+    -------
+    ndarray
+        10×10 correlation matrix
+    """
+    R = np.eye(10)
+    R[3, 4] = R[4, 3] = 0.60
+    R[5, 6] = R[6, 5] = 0.40
+    return R
+
+
+def sample_prior_correlations(n_samples, rng=None, sampler='mc'):
+    """
+    Draw all prior correlation values at once.
+
+    Parameters
+    ----------
+    n_samples : int
+        Number of Monte Carlo samples
+    rng : np.random.Generator, optional
+        Random generator (defaults to the global NumPy state)
+    sampler : str or UnitSampler
+        'mc' for plain Beta draws, 'sobol'/'halton' for scrambled
+        low-discrepancy points pushed through the Beta inverse CDF, or an
+        existing UnitSampler to continue its sequence
+
+    Returns
+    -------
+    ndarray
+        (n_samples, 3) array of ρ values, columns ordered as
+        MC_CORRELATION_PRIORS
+    """
+    if isinstance(sampler, UnitSampler):
+        priors = [(a, b, lower, width) for _, _, a, b, lower, width in MC_CORRELATION_PRIORS]
+        return scaled_beta_ppf(sampler.draw(n_samples), priors)
+    if sampler != 'mc':
+        return sample_prior_correlations(
+            n_samples, sampler=UnitSampler(len(MC_CORRELATION_PRIORS), sampler, rng))
+
+    beta = np.random.beta if rng is None else rng.beta
+    rho = np.empty((n_samples, len(MC_CORRELATION_PRIORS)))
+    for k, (_, _, a, b, lower, width) in enumerate(MC_CORRELATION_PRIORS):
+        rho[:, k] = lower + width * beta(a, b, n_samples)
+    return rho
+
+
+def build_correlation_stack(rho_samples):
+    """
+    Assemble the (N, 10, 10) stack of perturbed correlation matrices.
+
+    Parameters
+    ----------
+    rho_samples : array
+        (N, 3) prior draws from sample_prior_correlations
+
+    Returns
+    -------
+    ndarray
+        Correlation matrices, one per sample
+    """
+    n = len(rho_samples)
+    R = np.broadcast_to(mc_fixed_correlation_matrix(), (n, 10, 10)).copy()
+    for k, (i, j, *_) in enumerate(MC_CORRELATION_PRIORS):
+        R[:, i, j] = R[:, j, i] = rho_samples[:, k]
+    return R
+
+
+def propagate_systematic_budget_batch(sigma_vector, R_stack):
+    """
+    Vectorized Equation (6) over a stack of correlation matrices.
+
+    Parameters
+    ----------
+    sigma_vector : array
+        Individual systematic uncertainties (km/s/Mpc)
+    R_stack : array
+        (..., n, n) correlation matrices
+
+    Returns
+    -------
+    ndarray
+        σ_sys,corr for every matrix in the stack (km/s/Mpc)
+    """
+    sigma_sys_corr_sq = np.einsum('i,...ij,j->...', sigma_vector, R_stack, sigma_vector)
+    return np.sqrt(sigma_sys_corr_sq)
+
+
+def propagate_prior_correlations(rho_samples, sigma_vector=MC_SIGMA):
+    """
+    Closed-form σᵀRσ for the prior draws without building matrices.
+
+    σᵀRσ is linear in each off-diagonal ρ_ij, so
+    σ²_sys,corr = σᵀR_fixedσ + Σ_k 2σ_iσ_j ρ_k.
+
+    Parameters
+    ----------
+    rho_samples : array
+        (N, 3) prior draws from sample_prior_correlations
+    sigma_vector : array
+        Individual systematic uncertainties (km/s/Mpc)
+
+    Returns
+    -------
+    ndarray
+        σ_sys,corr for every sample (km/s/Mpc)
+    """
+    R_fixed = mc_fixed_correlation_matrix()
+    base = sigma_vector @ R_fixed @ sigma_vector
+    coeffs = np.array([2.0 * sigma_vector[i] * sigma_vector[j]
+                       for i, j, *_ in MC_CORRELATION_PRIORS])
+    return np.sqrt(base + rho_samples @ coeffs)
+
+
+def propagate_prior_correlations_validated(rho_samples, repair=False, chunk_size=100_000):
+    """
+    Propagate prior draws after checking that each perturbed R is PSD.
+
+    Matrices are built and validated in batched chunks. Invalid samples are
+    dropped, or replaced by their nearest correlation matrix if repair=True.
+
+    Parameters
+    ----------
+    rho_samples : array
+        (N, 3) prior draws from sample_prior_correlations
+    repair : bool
+        Project invalid matrices instead of rejecting them
+    chunk_size : int
+        Matrices built per chunk (bounds memory at chunk_size·n² floats)
+
+    Returns
+    -------
+    ndarray
+        σ_sys,corr for the accepted (or repaired) samples (km/s/Mpc)
+    int
+        Number of samples whose perturbed matrix was not PSD
+    """
+    sigma_sys_samples = []
+    n_rejected = 0
+
+    for start in range(0, len(rho_samples), chunk_size):
+        rho_block = rho_samples[start:start + chunk_size]
+        R_block, report = validate_and_repair(build_correlation_stack(rho_block), repair=repair)
+        n_rejected += report['n_rejected']
+
+        sigma_sys = propagate_prior_correlations(rho_block)
+        if repair:
+            invalid = ~report['valid']
+            sigma_sys[invalid] = propagate_systematic_budget_batch(MC_SIGMA, R_block[invalid])
+        else:
+            sigma_sys = sigma_sys[report['valid']]
+        sigma_sys_samples.append(sigma_sys)
+
+    return np.concatenate(sigma_sys_samples), n_rejected
+
+
+def summarize_sigma_sys_samples(sigma_sys_samples):
+    """
+    Posterior summary statistics for σ_sys,corr samples.
+
+    Parameters
+    ----------
+    sigma_sys_samples : array
+        Monte Carlo samples (km/s/Mpc)
+
+    Returns
+    -------
+    dict
+        Mean, median, std and 68%/95% interval bounds
+    """
+    q025, q16, q50, q84, q975 = np.percentile(sigma_sys_samples, [2.5, 16, 50, 84, 97.5])
+    return {
+        'mean': np.mean(sigma_sys_samples),
+        'median': q50,
+        'std': np.std(sigma_sys_samples),
+        'q16': q16,
+        'q84': q84,
+        'q025': q025,
+        'q975': q975
+    }
+
+
+def monte_carlo_correlation_uncertainty(n_samples=10000, batched=False, rng=None,
+                                        validate=False, repair=False, sampler='mc', store=None):
     """
     Monte Carlo propagation treating correlations as uncertain parameters.
 
@@ -213,57 +418,263 @@ def monte_carlo_correlation_uncertainty(n_samples=10000):
     ----------
     n_samples : int
         Number of Monte Carlo samples
+    batched : bool
+        Draw all ρ values at once and evaluate σᵀRσ in closed form
+        instead of propagating one matrix per sample
+    rng : np.random.Generator, optional
+        Random generator (defaults to the global NumPy state)
+    validate : bool
+        Check every perturbed matrix for positive semidefiniteness (batched)
+        and report the rejected fraction; implies the batched path
+    repair : bool
+        With validate=True, project invalid matrices onto the nearest
+        correlation matrix instead of rejecting them
+    sampler : str
+        'mc' (plain random draws), or 'sobol'/'halton' quasi-Monte Carlo
+        points; QMC samplers imply the batched path
+    store : SampleStore, optional
+        Append the σ_sys,corr samples to this on-disk store
 
     Returns
     -------
     dict
         Posterior distribution summary for σ_sys,corr
     """
-    # Systematic uncertainties (fixed)
-    sigma = np.array([1.0, 1.0, 1.0, 1.5, 0.5, 0.3, 0.3, 0.5, 0.4, 0.3])
-
-    # Prior distributions for key correlations (informative, not uniform)
-    # ρ(crowding, reddening) ~ Beta(α=5, β=3) scaled to [0.3, 0.7]
-    # ρ(metallicity, reddening) ~ Beta(α=4, β=6) scaled to [0.1, 0.5]
-    # ρ(period, metallicity) ~ Beta(α=3, β=5) scaled to [0.0, 0.4]
-
+    if validate:
+        rho_samples = sample_prior_correlations(n_samples, rng, sampler)
+        sigma_sys_samples, n_rejected = propagate_prior_correlations_validated(rho_samples, repair)
+        summary = summarize_sigma_sys_samples(sigma_sys_samples)
+        summary['rejected_fraction'] = n_rejected / n_samples
+        if store is not None:
+            store.append(sigma_sys_samples)
+        return summary, sigma_sys_samples
+
+    if batched or sampler != 'mc':
+        rho_samples = sample_prior_correlations(n_samples, rng, sampler)
+        sigma_sys_samples = propagate_prior_correlations(rho_samples)
+        if store is not None:
+            store.append(sigma_sys_samples)
+        return summarize_sigma_sys_samples(sigma_sys_samples), sigma_sys_samples
+
+    beta = np.random.beta if rng is None else rng.beta
     sigma_sys_samples = []
 
     for _ in range(n_samples):
-        R = np.eye(10)
+        R = mc_fixed_correlation_matrix()
 
         # Sample correlations from priors
-        rho_crowd_redd = 0.3 + 0.4 * np.random.beta(5, 3)
-        rho_metal_redd = 0.1 + 0.4 * np.random.beta(4, 6)
-        rho_period_metal = 0.0 + 0.4 * np.random.beta(3, 5)
-
-        # Set correlations
-        R[3, 7] = R[7, 3] = rho_crowd_redd
-        R[2, 7] = R[7, 2] = rho_metal_redd
-        R[1, 2] = R[2, 1] = rho_period_metal
-
-        # Fixed minor correlations (from baseline)
-        R[3, 4] = R[4, 3] = 0.60
-        R[5, 6] = R[6, 5] = 0.40
+        for i, j, a, b, lower, width in MC_CORRELATION_PRIORS:
+            R[i, j] = R[j, i] = lower + width * beta(a, b)
 
         # Propagate
-        sigma_sys = propagate_systematic_budget(sigma, R)
+        sigma_sys = propagate_systematic_budget(MC_SIGMA, R)
         sigma_sys_samples.append(sigma_sys)
 
     sigma_sys_samples = np.array(sigma_sys_samples)
+    if store is not None:
+        store.append(sigma_sys_samples)
+
+    return summarize_sigma_sys_samples(sigma_sys_samples), sigma_sys_samples
 
-    # Compute posterior summary
-    summary = {
-        'mean': np.mean(sigma_sys_samples),
-        'median': np.median(sigma_sys_samples),
-        'std': np.std(sigma_sys_samples),
-        'q16': np.percentile(sigma_sys_samples, 16),
-        'q84': np.percentile(sigma_sys_samples, 84),
-        'q025': np.percentile(sigma_sys_samples, 2.5),
-        'q975': np.percentile(sigma_sys_samples, 97.5)
-    }
 
-    return summary, sigma_sys_samples
+def streaming_monte_carlo_correlation_uncertainty(n_samples=10000, chunk_size=1_048_576,
+                                                  rng=None, compression=300, sampler='mc',
+                                                  store=None):
+    """
+    Constant-memory Monte Carlo propagation in fixed-size blocks.
+
+    Each block is drawn and propagated with the batched closed form, folded
+    into running moments and a t-digest quantile sketch, then discarded.
+    The returned accumulator can be merged with those from other shards
+    (StreamingSummary.merge) before calling summary().
+
+    Parameters
+    ----------
+    n_samples : int
+        Total number of Monte Carlo samples
+    chunk_size : int
+        Samples drawn per block (bounds peak memory)
+    rng : np.random.Generator, optional
+        Random generator (defaults to the global NumPy state)
+    compression : float
+        t-digest compression δ
+    sampler : str
+        'mc', 'sobol' or 'halton'; QMC sequences continue across blocks
+    store : SampleStore, optional
+        Also append every block to this on-disk store, so the full sample
+        set can be re-analysed later without re-sampling
+
+    Returns
+    -------
+    dict
+        Posterior distribution summary for σ_sys,corr
+    StreamingSummary
+        Mergeable accumulator for the drawn samples
+    """
+    accumulator = StreamingSummary(compression)
+    if sampler != 'mc':
+        sampler = UnitSampler(len(MC_CORRELATION_PRIORS), sampler, rng)
+
+    remaining = n_samples
+    while remaining > 0:
+        n_block = min(chunk_size, remaining)
+        rho_samples = sample_prior_correlations(n_block, rng, sampler)
+        sigma_sys_samples = propagate_prior_correlations(rho_samples)
+        accumulator.update(sigma_sys_samples)
+        if store is not None:
+            store.append(sigma_sys_samples)
+        remaining -= n_block
+
+    return accumulator.summary(), accumulator
+
+
+def adaptive_monte_carlo_correlation_uncertainty(tolerance=0.001, batch_size=4096,
+                                                min_batches=10, max_samples=100_000_000,
+                                                rng=None, compression=300, sampler='mc',
+                                                store=None):
+    """
+    Monte Carlo propagation that stops once every quantile has converged.
+
+    Samples are drawn in batches. The Monte Carlo standard error of each
+    reported quantile is estimated by batch means: the spread of the
+    per-batch quantiles divided by √(n_batches). Sampling stops when all
+    standard errors fall below the tolerance (after at least min_batches
+    batches) or max_samples is reached.
+
+    Parameters
+    ----------
+    tolerance : float
+        Target standard error for every quantile (km/s/Mpc)
+    batch_size : int
+        Samples per batch (large enough for stable 2.5/97.5% batch quantiles)
+    min_batches : int
+        Minimum number of batches before the stopping rule is checked
+    max_samples : int
+        Hard cap on the number of samples
+    rng : np.random.Generator, optional
+        Random generator (defaults to the global NumPy state)
+    compression : float
+        t-digest compression δ
+    sampler : str
+        'mc', 'sobol' or 'halton' (batch means are conservative for QMC)
+    store : SampleStore, optional
+        Append every batch to this on-disk store
+
+    Returns
+    -------
+    dict
+        Posterior distribution summary for σ_sys,corr, plus
+        'n_samples_used', 'converged' and the standard error 'se_<key>'
+        of every quantile
+    StreamingSummary
+        Mergeable accumulator for the drawn samples
+    """
+    accumulator = StreamingSummary(compression)
+    if sampler != 'mc':
+        sampler = UnitSampler(len(MC_CORRELATION_PRIORS), sampler, rng)
+
+    keys = list(SUMMARY_PERCENTILES)
+    percentiles = list(SUMMARY_PERCENTILES.values())
+    batch_quantiles = []
+    max_batches = max(min_batches, max_samples // batch_size)
+
+    while True:
+        rho_samples = sample_prior_correlations(batch_size, rng, sampler)
+        sigma_sys_samples = propagate_prior_correlations(rho_samples)
+        accumulator.update(sigma_sys_samples)
+        if store is not None:
+            store.append(sigma_sys_samples)
+        batch_quantiles.append(np.percentile(sigma_sys_samples, percentiles))
+
+        n_batches = len(batch_quantiles)
+        if n_batches < min_batches:
+            continue
+        standard_errors = np.std(batch_quantiles, axis=0, ddof=1) / np.sqrt(n_batches)
+        converged = bool(np.all(standard_errors < tolerance))
+        if converged or n_batches >= max_batches:
+            break
+
+    summary = accumulator.summary()
+    summary['n_samples_used'] = accumulator.count
+    summary['converged'] = converged
+    for key, se in zip(keys, standard_errors):
+        summary[f'se_{key}'] = se
+
+    return summary, accumulator
+
+
+def _streaming_shard(n_samples, rng, chunk_size, compression, sampler):
+    """Shard task: streaming Monte Carlo on one SeedSequence stream."""
+    _, accumulator = streaming_monte_carlo_correlation_uncertainty(
+        n_samples, chunk_size=chunk_size, rng=rng, compression=compression, sampler=sampler)
+    return accumulator
+
+
+def sharded_monte_carlo_correlation_uncertainty(n_samples=10000, seed=2025, n_shards=16,
+                                                max_workers=None, chunk_size=1_048_576,
+                                                compression=300, sampler='mc'):
+    """
+    Multi-core streaming Monte Carlo with reproducible shard streams.
+
+    The sample count is split into n_shards shards, each propagated with an
+    independent SeedSequence child on a process pool, and the shard
+    accumulators are merged in shard order. Results depend on
+    (seed, n_shards) only, not on max_workers.
+
+    Parameters
+    ----------
+    n_samples : int
+        Total number of Monte Carlo samples
+    seed : int
+        Root seed
+    n_shards : int
+        Number of independent shards
+    max_workers : int, optional
+        Process count (default: all cores; 1 runs in-process)
+    chunk_size : int
+        Samples drawn per block within a shard
+    compression : float
+        t-digest compression δ
+    sampler : str
+        'mc', 'sobol' or 'halton' (each shard gets its own scramble)
+
+    Returns
+    -------
+    dict
+        Posterior distribution summary for σ_sys,corr
+    StreamingSummary
+        Merged accumulator
+    """
+    accumulator = run_sharded(
+        _streaming_shard, n_samples, seed, n_shards=n_shards, max_workers=max_workers,
+        merge=merge_streaming_summaries,
+        task_kwargs={'chunk_size': chunk_size, 'compression': compression, 'sampler': sampler})
+    return accumulator.summary(), accumulator
+
+
+def qmc_convergence_report(n_values=(256, 1024, 4096, 16384), n_repeats=50):
+    """
+    Quantile precision of QMC versus plain Monte Carlo sampling.
+
+    Parameters
+    ----------
+    n_values : tuple of int
+        Sample sizes (powers of two for Sobol balance)
+    n_repeats : int
+        Independent replications per configuration
+
+    Returns
+    -------
+    pd.DataFrame
+        RMSE of each summary statistic per sampler and sample size, with
+        the equivalent plain-MC sample-size multiplier
+    """
+    def estimator(n_samples, sampler, rng):
+        summary, _ = monte_carlo_correlation_uncertainty(n_samples, batched=True,
+                                                         rng=rng, sampler=sampler)
+        return summary
+
+    return convergence_report(estimator, n_values, n_repeats)
 
 
 def main():
@@ -301,7 +712,12 @@ def main():
     print("MONTE CARLO CORRELATION UNCERTAINTY")
     print("=" * 60)
 
-    mc_summary, mc_samples = monte_carlo_correlation_uncertainty(n_samples=10000)
+    mc_config = {'n_samples': 10000, 'validate': True, 'priors': MC_CORRELATION_PRIORS,
+                 'sigma': MC_SIGMA.tolist()}
+    samples_path = OUTPUT_DIR / 'correlation_uncertainty_mc_samples'
+    with SampleStore(samples_path, config=mc_config, capacity=10000) as store:
+        mc_summary, mc_samples = monte_carlo_correlation_uncertainty(
+            n_samples=10000, validate=True, store=store)
 
     print(f"\nPosterior distribution for σ_sys,corr:")
     print(f"  Mean:   {mc_summary['mean']:.3f} km/s/Mpc")
@@ -309,6 +725,27 @@ def main():
     print(f"  Std:    {mc_summary['std']:.3f} km/s/Mpc")
     print(f"  68% CI: [{mc_summary['q16']:.3f}, {mc_summary['q84']:.3f}] km/s/Mpc")
     print(f"  95% CI: [{mc_summary['q025']:.3f}, {mc_summary['q975']:.3f}] km/s/Mpc")
+    print(f"  Non-PSD samples rejected: {100 * mc_summary['rejected_fraction']:.2f}%")
+    print()
+
+    # Adaptive stopping: draw until every quantile SE < 0.001 km/s/Mpc
+    adaptive_summary, _ = adaptive_monte_carlo_correlation_uncertainty(
+        tolerance=0.001, rng=np.random.default_rng(2025))
+    print("Adaptive MC (quantile SE < 0.001 km/s/Mpc):")
+    print(f"  Samples used: {adaptive_summary['n_samples_used']:,} "
+          f"(converged: {adaptive_summary['converged']})")
+    print(f"  95% CI: [{adaptive_summary['q025']:.4f} ± {adaptive_summary['se_q025']:.4f}, "
+          f"{adaptive_summary['q975']:.4f} ± {adaptive_summary['se_q975']:.4f}] km/s/Mpc")
+    print()
+
+    # Sampler convergence
+    print("=" * 60)
+    print("QMC vs PLAIN MC CONVERGENCE")
+    print("=" * 60)
+
+    convergence_df = qmc_convergence_report()
+    print(convergence_df[['sampler', 'n_samples', 'rmse_median', 'rmse_q025',
+                          'rmse_q975', 'speedup_vs_mc']].to_string(index=False))
     print()
 
     print(f"Baseline (fixed correlations): σ_sys,corr = {sigma_baseline:.3f} km/s/Mpc")
@@ -324,6 +761,9 @@ def main():
     mc_file = OUTPUT_DIR / 'correlation_uncertainty_mc.csv'
     mc_summary_df.to_csv(mc_file, index=False)
 
+    convergence_file = OUTPUT_DIR / 'correlation_qmc_convergence.csv'
+    convergence_df.to_csv(convergence_file, index=False)
+
     print("=" * 60)
     print("INTERPRETATION")
     print("=" * 60)
@@ -344,6 +784,8 @@ def main():
     print("✓ Saved results:")
     print(f"  - {sens_file}")
     print(f"  - {mc_file}")
+    print(f"  - {samples_path}.npy (σ_sys,corr samples)")
+    print(f"  - {convergence_file}")
     print()
     print("NEXT STEPS:")
     print("- Use in §A.5(iv) validation")
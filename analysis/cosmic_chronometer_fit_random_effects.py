@@ -19,9 +19,11 @@ Date: November 2025
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
 from pathlib import Path
 
+from closed_form_fits import solve_linear_H0
+from expansion_models import E_lcdm
+
 # =============================================================================
 # Configuration
 # =============================================================================
@@ -41,14 +43,6 @@ OMEGA_LAMBDA_PLANCK = 0.685
 # Functions
 # =============================================================================
 
-def H_LCDM(z, H0, Omega_m=OMEGA_M_PLANCK):
-    """
-    ΛCDM Hubble parameter H(z) = H₀ × √[Ωₘ(1+z)³ + Ω_Λ]
-    """
-    Omega_Lambda = 1 - Omega_m
-    return H0 * np.sqrt(Omega_m * (1+z)**3 + Omega_Lambda)
-
-
 def fit_H0_and_chi2(z, Hz, sigma_Hz, Omega_m=OMEGA_M_PLANCK):
     """
     Fit H₀ from H(z) data and compute χ² statistics.
@@ -60,20 +54,10 @@ def fit_H0_and_chi2(z, Hz, sigma_Hz, Omega_m=OMEGA_M_PLANCK):
         dof: Degrees of freedom
         chi2_red: Reduced chi-squared
     """
-    # Fit H₀ (Ωₘ fixed to Planck)
-    popt, pcov = curve_fit(H_LCDM, z, Hz, p0=[70.0], sigma=sigma_Hz, absolute_sigma=True)
-
-    H0_fit = popt[0]
-    H0_err = np.sqrt(pcov[0, 0])
-
-    # Calculate chi-squared
-    Hz_model = H_LCDM(z, H0_fit, Omega_m)
-    residuals = (Hz - Hz_model) / sigma_Hz
-    chi2 = np.sum(residuals**2)
-    dof = len(z) - 1  # 1 free parameter (H₀)
-    chi2_red = chi2 / dof
+    # Exact weighted least squares: H(z) = H₀·E(z) is linear in H₀
+    fit = solve_linear_H0(E_lcdm(z, Omega_m), Hz, sigma_Hz)
 
-    return H0_fit, H0_err, chi2, dof, chi2_red
+    return fit['H0'], fit['se_H0'], fit['chi2'], fit['dof'], fit['chi2_red']
 
 
 # =============================================================================
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Coverage and Calibration of the Random-Effects Estimators
+=========================================================
+
+The manuscript fits (cosmic-chronometer H(z), JAGB vs TRGB, Cepheid vs
+TRGB) each use a single synthetic realization with a fixed seed, which
+says nothing about estimator bias or whether the quoted errors cover the
+truth at the nominal rate.
+
+This harness draws thousands of independent realizations per
+configuration from the same generators, fits each with the production
+estimator (HierarchicalHzModel.fit_hierarchical, RandomEffectsModel.fit),
+and reports bias, RMSE, mean quoted SE against the empirical scatter, and
+the coverage of the 68%/95% Wald intervals (estimate ± z·SE) for H₀,
+σ_int, μ and τ. Realizations are sharded over a process pool with spawned
+seeds (parallel_sampling.run_sharded), so results do not depend on the
+worker count. Run time and throughput are reported for regression
+tracking.
+
+Note on τ truth: the JWST simulators draw offsets with the quoted total
+scatter and do not add the per-galaxy errors on top, so the intrinsic τ
+implied by the random-effects model is √(scatter² − error²). Fits on the
+τ = 0 boundary have no Wald interval and are excluded from τ coverage
+(their fraction is reported).
+
+Author: Distance Ladder Systematics Analysis
+Date: 2025-11-29
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy import stats
+
+from hierarchical_hz_fit import generate_cosmic_chronometer_realizations
+from jwst_random_effects_crossval import generate_jwst_realizations
+from parallel_sampling import concatenate_samples, run_sharded
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+# Generating parameters of the synthetic data (see load_cosmic_chronometer_data,
+# simulate_jagb_vs_trgb and simulate_cepheid_vs_trgb)
+CONFIGURATIONS = {
+    'cosmic_chronometers': {
+        'parameters': ('H0', 'sigma_int'),
+        'truth': (68.3, 2.0)
+    },
+    'jagb_vs_trgb': {
+        'parameters': ('mu', 'tau'),
+        'truth': (0.0017, np.sqrt(0.048**2 - 0.028**2))
+    },
+    'cepheid_vs_trgb': {
+        'parameters': ('mu', 'tau'),
+        'truth': (-0.024, np.sqrt(0.108**2 - 0.020**2))
+    }
+}
+
+
+def fit_cosmic_chronometer_realizations(n_realizations, rng):
+    """
+    Generate and fit synthetic CC compilations (shard task for run_sharded).
+
+    Returns
+    -------
+    ndarray
+        (n_realizations, 4) rows of [H0, se_H0, sigma_int, se_sigma_int]
+    """
+    fits = [model.fit_hierarchical()
+            for model in generate_cosmic_chronometer_realizations(n_realizations, rng)]
+    return np.array([[f['H0'], f['se_H0'], f['sigma_int'], f['se_sigma_int']] for f in fits])
+
+
+def fit_jwst_realizations(n_realizations, rng, comparison='jagb'):
+    """
+    Generate and fit synthetic galaxy samples (shard task for run_sharded).
+
+    Returns
+    -------
+    ndarray
+        (n_realizations, 4) rows of [mu, se_mu, tau, se_tau]
+    """
+    fits = [model.fit() for model in generate_jwst_realizations(n_realizations, rng, comparison)]
+    return np.array([[f['mu'], f['se_mu'], f['tau'], f['se_tau']] for f in fits])
+
+
+SHARD_TASKS = {
+    'cosmic_chronometers': (fit_cosmic_chronometer_realizations, {}),
+    'jagb_vs_trgb': (fit_jwst_realizations, {'comparison': 'jagb'}),
+    'cepheid_vs_trgb': (fit_jwst_realizations, {'comparison': 'cepheid'})
+}
+
+
+def summarize_coverage(estimates, errors, truth, levels=(0.68, 0.95)):
+    """
+    Bias, RMSE and Wald-interval coverage of one parameter.
+
+    Parameters
+    ----------
+    estimates, errors : array
+        (N,) point estimates and quoted standard errors (NaN where the
+        estimator reports none)
+    truth : float
+        Generating value
+    levels : tuple of float
+        Nominal interval levels
+
+    Returns
+    -------
+    dict
+        'truth', 'mean', 'bias', 'rmse', 'empirical_sd', 'mean_se',
+        'coverage<level>' per level, 'n_valid' (finite SE) and
+        'boundary_fraction' (no SE reported)
+    """
+    deviation = estimates - truth
+    valid = np.isfinite(errors)
+    summary = {
+        'truth': truth,
+        'mean': estimates.mean(),
+        'bias': deviation.mean(),
+        'rmse': np.sqrt(np.mean(deviation**2)),
+        'empirical_sd': estimates.std(ddof=1),
+        'mean_se': errors[valid].mean() if valid.any() else np.nan
+    }
+    for level in levels:
+        z = stats.norm.ppf(0.5 + 0.5 * level)
+        covered = np.abs(deviation[valid]) <= z * errors[valid]
+        summary[f'coverage{int(round(100 * level))}'] = covered.mean() if valid.any() else np.nan
+    summary['n_valid'] = int(valid.sum())
+    summary['boundary_fraction'] = 1.0 - valid.mean()
+    return summary
+
+
+def run_coverage_simulation(configuration, n_realizations=2000, seed=2025, n_shards=16,
+                            max_workers=None):
+    """
+    Coverage study for one configuration.
+
+    Parameters
+    ----------
+    configuration : str
+        Key of CONFIGURATIONS ('cosmic_chronometers', 'jagb_vs_trgb',
+        'cepheid_vs_trgb')
+    n_realizations : int
+        Number of synthetic realizations
+    seed : int
+        Root seed (results are independent of max_workers)
+    n_shards : int
+        Number of random streams / work units
+    max_workers : int, optional
+        Process count (default: all cores)
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per parameter with the summarize_coverage columns plus
+        'elapsed_s' and 'realizations_per_s'
+    """
+    if configuration not in CONFIGURATIONS:
+        raise ValueError(f"Unknown configuration '{configuration}' "
+                         f"(choose from {list(CONFIGURATIONS)})")
+    task, task_kwargs = SHARD_TASKS[configuration]
+    config = CONFIGURATIONS[configuration]
+
+    start = time.perf_counter()
+    fits = run_sharded(task, n_realizations, seed, n_shards=n_shards, max_workers=max_workers,
+                       merge=concatenate_samples, task_kwargs=task_kwargs)
+    elapsed = time.perf_counter() - start
+
+    rows = []
+    for k, (name, truth) in enumerate(zip(config['parameters'], config['truth'])):
+        row = {'configuration': configuration, 'parameter': name}
+        row.update(summarize_coverage(fits[:, 2 * k], fits[:, 2 * k + 1], truth))
+        row['n_realizations'] = n_realizations
+        row['elapsed_s'] = elapsed
+        row['realizations_per_s'] = n_realizations / elapsed
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def main():
+    print("=" * 80)
+    print("COVERAGE SIMULATION - RANDOM-EFFECTS ESTIMATORS")
+    print("=" * 80)
+    print()
+
+    n_realizations = 2000
+    tables = []
+    for configuration in CONFIGURATIONS:
+        table = run_coverage_simulation(configuration, n_realizations)
+        tables.append(table)
+
+        print(f"{configuration}: {n_realizations} realizations in {table['elapsed_s'].iloc[0]:.1f} s "
+              f"({table['realizations_per_s'].iloc[0]:.0f} fits/s)")
+        for _, row in table.iterrows():
+            print(f"  {row['parameter']:>10s}: truth {row['truth']:.4f}, bias {row['bias']:+.4f}, "
+                  f"RMSE {row['rmse']:.4f}, SE {row['mean_se']:.4f} vs SD {row['empirical_sd']:.4f}, "
+                  f"coverage 68% {row['coverage68']:.3f} / 95% {row['coverage95']:.3f}"
+                  + (f" (boundary {row['boundary_fraction']:.1%})" if row['boundary_fraction'] > 0 else ""))
+        print()
+
+    results = pd.concat(tables, ignore_index=True)
+    output_file = DATA_DIR / "coverage_simulation.csv"
+    results.to_csv(output_file, index=False)
+    print(f"Results saved: {output_file}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
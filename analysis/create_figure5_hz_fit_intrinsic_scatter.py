@@ -11,9 +11,11 @@ Output: figures/figure5_h6_fit.png (publication quality)
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit, minimize_scalar
 from pathlib import Path
 
+from closed_form_fits import solve_linear_H0
+from expansion_models import E_lcdm, H_LCDM
+
 # =============================================================================
 # Load Cosmic Chronometer Data
 # =============================================================================
@@ -44,11 +46,6 @@ sigma_Hz = data['sigma_Hz'].values
 
 OMEGA_M_PLANCK = 0.315  # Planck 2018
 
-def H_LCDM(z, H0, Omega_m=OMEGA_M_PLANCK):
-    """ΛCDM Hubble parameter: H(z) = H₀ × √[Ωₘ(1+z)³ + Ω_Λ]"""
-    Omega_Lambda = 1 - Omega_m
-    return H0 * np.sqrt(Omega_m * (1+z)**3 + Omega_Lambda)
-
 # =============================================================================
 # Fit WITHOUT Intrinsic Scatter (Original)
 # =============================================================================
@@ -57,16 +54,16 @@ print("\n" + "="*80)
 print("FIT 1: WITHOUT INTRINSIC SCATTER (Original)")
 print("="*80)
 
-popt_original, pcov_original = curve_fit(H_LCDM, z, Hz, p0=[70.0],
-                                         sigma=sigma_Hz, absolute_sigma=True)
+E_z = E_lcdm(z)  # H(z) = H₀·E(z) is linear in H₀
+fit_original = solve_linear_H0(E_z, Hz, sigma_Hz)
 
-H0_original = popt_original[0]
-H0_err_original = np.sqrt(pcov_original[0, 0])
+H0_original = fit_original['H0']
+H0_err_original = fit_original['se_H0']
 
 Hz_model_original = H_LCDM(z, H0_original)
-chi2_original = np.sum(((Hz - Hz_model_original) / sigma_Hz)**2)
-dof = len(z) - 1
-chi2_red_original = chi2_original / dof
+chi2_original = fit_original['chi2']
+dof = fit_original['dof']
+chi2_red_original = fit_original['chi2_red']
 
 print(f"H₀:        {H0_original:.2f} ± {H0_err_original:.2f} km/s/Mpc")
 print(f"χ²:        {chi2_original:.2f}")
@@ -84,24 +81,18 @@ print("="*80)
 def fit_with_intrinsic_scatter(sigma_int):
     """
     Fit H₀ with given intrinsic scatter added in quadrature to errors.
-    Returns χ²_red for optimization.
+    Returns χ²_red for optimization, H₀ and its uncertainty.
+
+    sigma_int may be an array: every value is fitted in one batched pass.
     """
     # Total variance = measurement variance + intrinsic variance
-    sigma_total_sq = sigma_Hz**2 + sigma_int**2
-    sigma_total = np.sqrt(sigma_total_sq)
+    sigma_int = np.asarray(sigma_int, dtype=float)[..., np.newaxis]
+    sigma_total = np.sqrt(sigma_Hz**2 + sigma_int**2)
 
     # Fit H₀
-    popt, pcov = curve_fit(H_LCDM, z, Hz, p0=[70.0],
-                          sigma=sigma_total, absolute_sigma=True)
-
-    H0_fit = popt[0]
-    Hz_model = H_LCDM(z, H0_fit)
-
-    # Calculate χ²_red
-    chi2 = np.sum(((Hz - Hz_model) / sigma_total)**2)
-    chi2_red = chi2 / dof
+    fit = solve_linear_H0(E_z, Hz, sigma_total)
 
-    return chi2_red, H0_fit, popt, pcov
+    return fit['chi2_red'], fit['H0'], fit['se_H0']
 
 # For χ²_red < 1, we need to REDUCE errors, not add scatter
 # Calculate scaling factor needed to achieve χ²_red = 1
@@ -112,15 +103,14 @@ print(f"\nNote: χ²_red < 1 indicates over-estimated errors")
 print(f"Scaling factor: {scale_factor:.3f} (reduces errors to achieve χ²_red = 1)")
 
 # Refit with scaled errors
-popt_scaled, pcov_scaled = curve_fit(H_LCDM, z, Hz, p0=[70.0],
-                                     sigma=sigma_Hz_scaled, absolute_sigma=True)
+fit_scaled = solve_linear_H0(E_z, Hz, sigma_Hz_scaled)
 
-H0_scaled = popt_scaled[0]
-H0_err_scaled = np.sqrt(pcov_scaled[0, 0])
+H0_scaled = fit_scaled['H0']
+H0_err_scaled = fit_scaled['se_H0']
 
 Hz_model_scaled = H_LCDM(z, H0_scaled)
-chi2_scaled = np.sum(((Hz - Hz_model_scaled) / sigma_Hz_scaled)**2)
-chi2_red_scaled = chi2_scaled / dof
+chi2_scaled = fit_scaled['chi2']
+chi2_red_scaled = fit_scaled['chi2_red']
 
 # For display purposes, treat this as "no intrinsic scatter needed"
 sigma_intrinsic_optimal = 0.0
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Expansion-History Models E(z; θ) for H(z) Fits
+==============================================
+
+Registry of dimensionless expansion rates E(z) = H(z)/H₀ shared by every
+H(z) fit in the repo (hierarchical, random-effects, H6, Figure 5 and the
+(H₀, Ωₘ) grid), so alternative cosmologies are fitted with the same
+closed-form and profile solvers as flat ΛCDM.
+
+    lcdm     E² = Ωₘ x³ + (1 − Ωₘ)
+    wcdm     E² = Ωₘ x³ + (1 − Ωₘ) x^{3(1+w₀)}
+    cpl      E² = Ωₘ x³ + (1 − Ωₘ) x^{3(1+w₀+wₐ)} exp(−3wₐ z/x)
+    nonflat  E² = Ωₘ x³ + Ω_k x² + Ω_Λ,   Ω_k = 1 − Ωₘ − Ω_Λ
+
+with x = 1 + z. Kernels broadcast z against the parameters (e.g. z of
+shape (n,) with Ωₘ of shape (m, 1) gives an (m, n) table) and evaluate in
+place in an optional preallocated `out` buffer, so (θ-grid × z) tables
+are built without full-size temporaries.
+
+References:
+    - Chevallier & Polarski 2001; Linder 2003 (CPL parametrization)
+    - Planck 2018 VI (Ωₘ = 0.315)
+
+Author: Distance Ladder Systematics Analysis
+Date: 2025-11-30
+"""
+
+import numpy as np
+
+OMEGA_M_PLANCK = 0.315
+OMEGA_LAMBDA_PLANCK = 0.685
+
+
+def _output(out, *arrays):
+    """Allocate (or check) the broadcast output buffer."""
+    shape = np.broadcast_shapes(*(np.shape(a) for a in arrays))
+    if out is None:
+        return np.empty(shape)
+    if out.shape != shape:
+        raise ValueError(f"Output buffer shape {out.shape} does not match broadcast shape {shape}")
+    return out
+
+
+def E_lcdm(z, Omega_m=OMEGA_M_PLANCK, out=None):
+    """
+    Flat ΛCDM: E(z) = √(1 + Ωₘ[(1+z)³ − 1]).
+
+    Parameters
+    ----------
+    z : float or array
+        Redshift
+    Omega_m : float or array
+        Matter density (broadcast against z)
+    out : ndarray, optional
+        Preallocated output of the broadcast shape
+
+    Returns
+    -------
+    ndarray
+        E(z)
+    """
+    out = _output(out, z, Omega_m)
+    np.add(z, 1.0, out=out)
+    np.power(out, 3, out=out)
+    out -= 1.0
+    out *= Omega_m
+    out += 1.0
+    return np.sqrt(out, out=out)
+
+
+def E_wcdm(z, Omega_m=OMEGA_M_PLANCK, w0=-1.0, out=None):
+    """
+    Flat wCDM (constant dark-energy equation of state w₀).
+
+    E(z) = √((1+z)³ [Ωₘ + (1 − Ωₘ)(1+z)^{3w₀}]); parameters as E_lcdm.
+    """
+    out = _output(out, z, Omega_m, w0)
+    x = np.add(z, 1.0)
+    np.power(np.broadcast_to(x, out.shape), np.multiply(3.0, w0), out=out)
+    out *= np.subtract(1.0, Omega_m)
+    out += Omega_m
+    out *= x**3
+    return np.sqrt(out, out=out)
+
+
+def E_cpl(z, Omega_m=OMEGA_M_PLANCK, w0=-1.0, wa=0.0, out=None):
+    """
+    Flat CPL dark energy, w(a) = w₀ + wₐ(1 − a).
+
+    E(z) = √((1+z)³ [Ωₘ + (1 − Ωₘ)(1+z)^{3(w₀+wₐ)} exp(−3wₐ z/(1+z))]);
+    parameters as E_lcdm.
+    """
+    out = _output(out, z, Omega_m, w0, wa)
+    np.multiply(np.log1p(z), np.multiply(3.0, np.add(w0, wa)), out=out)
+    out -= np.multiply(3.0, wa) * (np.divide(z, np.add(z, 1.0)))
+    np.exp(out, out=out)
+    out *= np.subtract(1.0, Omega_m)
+    out += Omega_m
+    out *= np.add(z, 1.0)**3
+    return np.sqrt(out, out=out)
+
+
+def E_nonflat(z, Omega_m=OMEGA_M_PLANCK, Omega_Lambda=OMEGA_LAMBDA_PLANCK, out=None):
+    """
+    Non-flat ΛCDM with curvature Ω_k = 1 − Ωₘ − Ω_Λ.
+
+    E(z) = √((1+z)² [Ωₘ(1+z) + Ω_k] + Ω_Λ); parameters as E_lcdm.
+    """
+    out = _output(out, z, Omega_m, Omega_Lambda)
+    x = np.add(z, 1.0)
+    np.multiply(x, Omega_m, out=out)
+    out += np.subtract(np.subtract(1.0, Omega_m), Omega_Lambda)
+    out *= x**2
+    out += Omega_Lambda
+    return np.sqrt(out, out=out)
+
+
+EXPANSION_MODELS = {
+    'lcdm': {'kernel': E_lcdm, 'parameters': {'Omega_m': OMEGA_M_PLANCK}},
+    'wcdm': {'kernel': E_wcdm, 'parameters': {'Omega_m': OMEGA_M_PLANCK, 'w0': -1.0}},
+    'cpl': {'kernel': E_cpl, 'parameters': {'Omega_m': OMEGA_M_PLANCK, 'w0': -1.0, 'wa': 0.0}},
+    'nonflat': {'kernel': E_nonflat,
+                'parameters': {'Omega_m': OMEGA_M_PLANCK, 'Omega_Lambda': OMEGA_LAMBDA_PLANCK}}
+}
+
+
+def expansion_parameters(model='lcdm', **params):
+    """
+    Full parameter set of a registered model (defaults filled in).
+
+    Raises
+    ------
+    ValueError
+        Unknown model or parameter name
+    """
+    if model not in EXPANSION_MODELS:
+        raise ValueError(f"Unknown expansion model '{model}' (choose from {list(EXPANSION_MODELS)})")
+    defaults = EXPANSION_MODELS[model]['parameters']
+    unknown = set(params) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown parameters {sorted(unknown)} for '{model}' "
+                         f"(expected {list(defaults)})")
+    return {**defaults, **params}
+
+
+def expansion_rate(z, model='lcdm', out=None, **params):
+    """
+    E(z; θ) for a registered model.
+
+    Parameters
+    ----------
+    z : float or array
+        Redshift
+    model : str
+        Key of EXPANSION_MODELS
+    out : ndarray, optional
+        Preallocated output of the broadcast shape
+    **params
+        Model parameters (missing ones take the registry defaults)
+
+    Returns
+    -------
+    ndarray
+        E(z), broadcast over z and the parameters
+    """
+    return EXPANSION_MODELS[model]['kernel'](z, out=out, **expansion_parameters(model, **params))
+
+
+def expansion_grid(z, model='lcdm', out=None, **param_grids):
+    """
+    (θ-grid × z) table of E in one broadcast kernel call.
+
+    Parameters
+    ----------
+    z : array
+        (n,) redshifts
+    model : str
+        Key of EXPANSION_MODELS
+    out : ndarray, optional
+        Preallocated (m, n) output
+    **param_grids
+        Parameter values, each broadcastable to a common (m,) shape
+        (scalars stay fixed)
+
+    Returns
+    -------
+    ndarray
+        (m, n) table E[k, i] = E(z_i; θ_k)
+    """
+    z = np.asarray(z, dtype=float)
+    params = {name: np.asarray(value, dtype=float)[..., np.newaxis]
+              for name, value in param_grids.items()}
+    return expansion_rate(z, model, out=out, **params)
+
+
+def H_LCDM(z, H0, Omega_m=OMEGA_M_PLANCK):
+    """
+    Flat ΛCDM Hubble parameter H(z) = H₀·√[Ωₘ(1+z)³ + Ω_Λ] (km/s/Mpc).
+    """
+    return H0 * E_lcdm(z, Omega_m)
@@ -17,6 +17,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from joint_correlation_sweep import joint_correlation_sweep, sweep_extremes
+
 # =============================================================================
 # Configuration
 # =============================================================================
@@ -179,6 +181,35 @@ print(f"  Maximum tension: {results_df['hubble_tension_sigma'].max():.2f}σ")
 print(f"  Percentage of tests with tension < 2σ: {100 * (results_df['hubble_tension_sigma'] < 2.0).sum() / len(results_df):.1f}%")
 print()
 
+# =============================================================================
+# Joint Sweep: All Key Pairs Varied Simultaneously
+# =============================================================================
+
+print("=" * 80)
+print("JOINT SWEEP: ALL KEY PAIRS VARIED SIMULTANEOUSLY")
+print("=" * 80)
+print()
+
+joint = joint_correlation_sweep(
+    sigma_sources, R_baseline,
+    pairs=[(pair['i'], pair['j']) for pair in CORRELATION_PAIRS],
+    rho_grid=np.linspace(0.0, 0.8, 17),
+    H0_cepheid=H0_CORRECTED, sigma_stat=SIGMA_STAT,
+    H0_ref=H0_PLANCK, sigma_ref=SIGMA_PLANCK,
+    validate_psd=True
+)
+joint_extremes = sweep_extremes(joint, valid_only=True)
+valid_sigma_sys = joint['sigma_sys'][joint['psd_valid']]
+
+print(f"Grid points: {joint['tension'].size} ({' × '.join(str(n) for n in joint['tension'].shape)})")
+print(f"  Non-PSD correlation matrices rejected: {100 * joint['rejected_fraction']:.1f}%")
+print(f"  σ_sys range (valid): [{valid_sigma_sys.min():.2f}, {valid_sigma_sys.max():.2f}] km/s/Mpc")
+print(f"  Tension range: [{joint_extremes['min']['tension']:.2f}σ, {joint_extremes['max']['tension']:.2f}σ]")
+print(f"  Percentage of valid joint grid with tension < 2σ: {100 * joint_extremes['fraction_below_threshold']:.1f}%")
+print(f"  Joint worst case: ρ = " + ", ".join(
+    f"{pair['name']}={rho:.2f}" for pair, rho in zip(CORRELATION_PAIRS, joint_extremes['max']['rho'])))
+print()
+
 # =============================================================================
 # Save Results
 # =============================================================================
@@ -187,6 +218,19 @@ output_file = data_dir / "extended_correlation_sensitivity_results.csv"
 results_df.to_csv(output_file, index=False)
 print(f"Results saved: {output_file}")
 
+joint_file = data_dir / "extended_correlation_joint_sweep.npz"
+np.savez_compressed(
+    joint_file,
+    pairs=np.array([(pair['i'], pair['j']) for pair in CORRELATION_PAIRS]),
+    pair_names=np.array([pair['name'] for pair in CORRELATION_PAIRS]),
+    rho_axes=np.array(joint['rho_axes']),
+    sigma_sys_corr=joint['sigma_sys'],
+    hubble_tension_sigma=joint['tension'],
+    below_threshold=joint['below_threshold'],
+    psd_valid=joint['psd_valid']
+)
+print(f"Joint sweep cube saved: {joint_file}")
+
 # =============================================================================
 # Visualization
 # =============================================================================
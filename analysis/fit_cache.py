@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Memoized Model Fits with Invalidation on Data Mutation
+======================================================
+
+The pipelines query the same fit repeatedly (analyze_* fits a model, then
+compute_scatter_ratio and save_results fit it again; fit_hierarchical and
+sample_posterior re-run fit_unscaled). Decorating the fit methods with
+cached_fit stores each result on the instance, keyed by the method, the
+instance's data version and the bound fit options, so repeated queries
+are free.
+
+Methods that change the data are decorated with invalidates_fits, which
+bumps the data version and drops the cached results. Assigning data
+attributes directly bypasses this; call invalidate_fits(model) after such
+edits.
+
+Cached results are returned as deep copies, so callers may edit them
+(including arrays, tables and interval dicts in place) without affecting
+the cache.
+Calls whose options are not hashable are computed without caching.
+
+Author: Distance Ladder Systematics Analysis
+Date: 2025-12-02
+"""
+
+import copy
+import functools
+import inspect
+
+
+def invalidate_fits(model):
+    """Bump the data version of a model and drop its cached fits."""
+    model._data_version = getattr(model, '_data_version', 0) + 1
+    model.__dict__.get('_fit_cache', {}).clear()
+
+
+def cached_fit(method):
+    """
+    Memoize a fit method per instance, keyed by data version and options.
+
+    Default arguments are filled in before keying, so fit() and
+    fit(method='profile') share one entry. The undecorated method is
+    available as the wrapper's `uncached` attribute.
+
+    Each call returns a deep copy of the cached result:
+
+    >>> import numpy as np
+    >>> class Model:
+    ...     @cached_fit
+    ...     def fit(self):
+    ...         return {'cov': np.eye(2), 'intervals': {0.68: (0.0, 1.0)}}
+    >>> model = Model()
+    >>> result = model.fit()
+    >>> result['cov'][0, 0] = 99.0
+    >>> result['intervals'][0.68] = None
+    >>> float(model.fit()['cov'][0, 0]), model.fit()['intervals']
+    (1.0, {0.68: (0.0, 1.0)})
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        options = tuple(item for item in bound.arguments.items() if item[1] is not self)
+        key = (method.__name__, getattr(self, '_data_version', 0), options)
+        try:
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+
+        cache = self.__dict__.setdefault('_fit_cache', {})
+        if key not in cache:
+            cache[key] = method(self, *args, **kwargs)
+        return copy.deepcopy(cache[key])
+
+    wrapper.uncached = method
+    return wrapper
+
+
+def invalidates_fits(method):
+    """Mark a method as mutating the model data (clears cached fits)."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            invalidate_fits(self)
+
+    return wrapper
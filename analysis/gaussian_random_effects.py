@@ -0,0 +1,823 @@
+#!/usr/bin/env python3
+"""
+Gaussian Random-Effects Likelihood with Analytic Derivatives
+============================================================
+
+Shared likelihood for the hierarchical fits (HierarchicalHzModel,
+RandomEffectsModel):
+
+    y_i ~ N(θ·x_i, s_i² + τ²),   parameters (θ, ℓ = log τ)
+
+with x_i = E(z_i) and θ = H₀ for H(z) data, or x_i = 1 and θ = μ for
+galaxy-level offsets. With v_i = s_i² + τ² and r_i = y_i − θx_i:
+
+    NLL       = ½ Σ [log(2π v) + r²/v]
+    ∂/∂θ      = −Σ x r / v
+    ∂/∂ℓ      = Σ τ² (1/v − r²/v²)
+    ∂²/∂θ²    = Σ x² / v
+    ∂²/∂θ∂ℓ   = Σ 2τ² x r / v²
+    ∂²/∂ℓ²    = Σ [2τ² (1/v − r²/v²) + 2τ⁴ (2r²/v³ − 1/v²)]
+
+The gradient drives L-BFGS-B / trust-region Newton optimizers, and the
+observed information (Hessian at the MLE) gives standard errors for θ and
+τ (delta method, se_τ = τ·se_ℓ).
+
+Since θ̂(τ) is a closed-form weighted mean, fit_random_effects_profile
+reduces the fit to a 1-D root find of the profile score in τ (ML or REML)
+and returns profile-likelihood intervals for τ.
+
+Author: Distance Ladder Systematics Analysis
+Date: 2025-11-26
+"""
+
+import warnings
+
+import numpy as np
+from scipy import integrate, optimize, signal, stats
+
+from ensemble_sampler import flatten_chain, initialize_walkers, sample_ensemble
+
+GRADIENT_METHODS = ('L-BFGS-B', 'trust-exact', 'Newton-CG', 'BFGS')
+
+# τ below this fraction of the median measurement error is treated as the
+# τ = 0 boundary, where the information matrix for τ is degenerate
+TAU_BOUNDARY_FRACTION = 1e-3
+
+
+def random_effects_nll(params, y, x, s):
+    """
+    Negative log-likelihood of the Gaussian random-effects model.
+
+    Parameters
+    ----------
+    params : array
+        [θ, log τ]
+    y, x, s : array
+        Observations, design values and measurement errors
+
+    Returns
+    -------
+    float
+        Negative log-likelihood
+    """
+    theta, log_tau = params
+    total_var = s**2 + np.exp(2 * log_tau)
+    return 0.5 * np.sum(np.log(2 * np.pi * total_var) + (y - theta * x)**2 / total_var)
+
+
+def random_effects_gradient(params, y, x, s):
+    """
+    Analytic gradient of random_effects_nll with respect to (θ, log τ).
+
+    Returns
+    -------
+    ndarray
+        (2,) gradient
+    """
+    theta, log_tau = params
+    tau_sq = np.exp(2 * log_tau)
+    inv_var = 1.0 / (s**2 + tau_sq)
+    r = y - theta * x
+    return np.array([
+        -np.sum(x * r * inv_var),
+        tau_sq * np.sum(inv_var - (r * inv_var)**2)
+    ])
+
+
+def random_effects_hessian(params, y, x, s):
+    """
+    Analytic Hessian of random_effects_nll with respect to (θ, log τ).
+
+    Returns
+    -------
+    ndarray
+        (2, 2) Hessian
+    """
+    theta, log_tau = params
+    tau_sq = np.exp(2 * log_tau)
+    inv_var = 1.0 / (s**2 + tau_sq)
+    r = y - theta * x
+    r_sq_inv_var = r**2 * inv_var
+
+    h_tt = np.sum(x**2 * inv_var)
+    h_tl = 2 * tau_sq * np.sum(x * r * inv_var**2)
+    h_ll = np.sum(2 * tau_sq * inv_var * (1 - r_sq_inv_var)
+                  + 2 * tau_sq**2 * inv_var**2 * (2 * r_sq_inv_var - 1))
+    return np.array([[h_tt, h_tl], [h_tl, h_ll]])
+
+
+def observed_information_errors(params, y, x, s):
+    """
+    Standard errors of (θ, τ) from the observed information matrix.
+
+    Parameters
+    ----------
+    params : array
+        MLE [θ, log τ]
+    y, x, s : array
+        Observations, design values and measurement errors
+
+    Returns
+    -------
+    dict
+        'se_theta', 'se_tau', and 'cov' (covariance of (θ, τ)); se_tau is
+        NaN when τ is on the boundary (τ → 0) or the information matrix is
+        not positive definite, in which case se_theta is the conditional
+        error at fixed τ
+    """
+    hessian = random_effects_hessian(params, y, x, s)
+    tau = np.exp(params[1])
+    jacobian = np.diag([1.0, tau])  # d(θ, τ)/d(θ, log τ)
+
+    try:
+        if tau < TAU_BOUNDARY_FRACTION * np.median(s):
+            raise np.linalg.LinAlgError("τ on the boundary")
+        np.linalg.cholesky(hessian)
+        cov_log = np.linalg.inv(hessian)
+    except np.linalg.LinAlgError:
+        cov = np.full((2, 2), np.nan)
+        cov[0, 0] = 1.0 / hessian[0, 0]
+        return {'se_theta': np.sqrt(cov[0, 0]), 'se_tau': np.nan, 'cov': cov}
+
+    cov = jacobian @ cov_log @ jacobian
+    return {'se_theta': np.sqrt(cov[0, 0]), 'se_tau': np.sqrt(cov[1, 1]), 'cov': cov}
+
+
+def fit_random_effects(y, x, s, params_init, method='L-BFGS-B', tol=1e-9):
+    """
+    Maximum-likelihood fit of (θ, τ) with analytic derivatives.
+
+    Parameters
+    ----------
+    y, x, s : array
+        Observations, design values and measurement errors
+    params_init : array
+        Starting [θ, log τ]
+    method : str
+        Gradient-based scipy.optimize.minimize method (GRADIENT_METHODS), or
+        'Nelder-Mead' for the derivative-free legacy path
+    tol : float
+        Optimizer tolerance
+
+    Returns
+    -------
+    dict
+        'theta', 'tau', 'log_tau', 'se_theta', 'se_tau', 'cov', 'nll',
+        'nfev' (likelihood evaluations) and 'success'
+    """
+    y, x, s = (np.asarray(a, dtype=float) for a in (y, x, s))
+    args = (y, x, s)
+
+    if method == 'Nelder-Mead':
+        result = optimize.minimize(random_effects_nll, params_init, args=args,
+                                   method='Nelder-Mead',
+                                   options={'xatol': tol, 'fatol': tol, 'maxiter': 10_000})
+    elif method in GRADIENT_METHODS:
+        hess = random_effects_hessian if method in ('trust-exact', 'Newton-CG') else None
+        options = {
+            'L-BFGS-B': {'gtol': tol, 'ftol': tol * 1e-5},
+            'Newton-CG': {'xtol': tol}
+        }.get(method, {'gtol': tol})
+        result = optimize.minimize(random_effects_nll, params_init, args=args, method=method,
+                                   jac=random_effects_gradient, hess=hess, options=options)
+    else:
+        raise ValueError(f"Unknown method '{method}' (choose from "
+                         f"{GRADIENT_METHODS + ('Nelder-Mead',)})")
+
+    errors = observed_information_errors(result.x, *args)
+
+    return {
+        'theta': result.x[0],
+        'tau': np.exp(result.x[1]),
+        'log_tau': result.x[1],
+        **errors,
+        'nll': result.fun,
+        'nfev': result.nfev,
+        'success': result.success
+    }
+
+# -----------------------------------------------------------------------------
+# Profile likelihood: θ in closed form, 1-D root find in τ
+# -----------------------------------------------------------------------------
+
+def _profile_terms(tau, y, x, s):
+    # Dot products rather than np.sum: these run once per root-find step on
+    # arrays of tens of elements, where the reduction wrapper dominates
+    inv_var = 1.0 / (s**2 + tau**2)
+    weighted_x = x * inv_var
+    fisher = weighted_x @ x
+    theta = (weighted_x @ y) / fisher
+    return theta, y - theta * x, inv_var, fisher
+
+
+def profile_random_effects_nll(tau, y, x, s, reml=False):
+    """
+    Profile negative log-likelihood in τ (θ at its conditional MLE).
+
+    For fixed τ the MLE of θ is the weighted mean θ̂(τ) = Σ(x y/v) / Σ(x²/v).
+    With reml=True the restricted likelihood adds ½ log(Σ x²/v / 2π), which
+    removes the downward bias of the ML τ in small samples.
+
+    Parameters
+    ----------
+    tau : float
+        Intrinsic scatter (≥ 0)
+    y, x, s : array
+        Observations, design values and measurement errors
+    reml : bool
+        Restricted (REML) instead of ordinary profile likelihood
+
+    Returns
+    -------
+    float
+        Profile (or restricted) negative log-likelihood
+    """
+    _, r, inv_var, fisher = _profile_terms(tau, y, x, s)
+    nll = 0.5 * (y.size * np.log(2 * np.pi) - np.log(inv_var).sum() + (r * r) @ inv_var)
+    if reml:
+        nll += 0.5 * np.log(fisher / (2 * np.pi))
+    return nll
+
+
+def _profile_score(tau, y, x, s, reml):
+    """(1/τ)·d(profile NLL)/dτ; negative where the profile still decreases."""
+    _, r, inv_var, fisher = _profile_terms(tau, y, x, s)
+    weighted_r = r * inv_var
+    score = inv_var.sum() - weighted_r @ weighted_r
+    if reml:
+        score -= (x * x) @ (inv_var * inv_var) / fisher
+    return score
+
+
+def _expand_bracket(func, lo, hi):
+    """Double hi until func changes sign from func(lo)."""
+    while np.sign(func(hi)) == np.sign(func(lo)):
+        lo, hi = hi, 2.0 * hi
+    return lo, hi
+
+
+def profile_tau_interval(y, x, s, tau_hat, levels=(0.68, 0.95), reml=False, xtol=1e-12):
+    """
+    Profile-likelihood confidence intervals for τ.
+
+    Bounds solve 2·[NLL_p(τ) − NLL_p(τ̂)] = χ²₁(level); the lower bound is
+    0 when τ = 0 lies inside the region.
+
+    Parameters
+    ----------
+    y, x, s : array
+        Observations, design values and measurement errors
+    tau_hat : float
+        MLE (or REML estimate) of τ
+    levels : tuple of float
+        Confidence levels
+    reml : bool
+        Use the restricted profile (match the estimate)
+    xtol : float
+        Absolute tolerance of the root finds
+
+    Returns
+    -------
+    dict
+        {level: (lower, upper)}
+    """
+    nll_min = profile_random_effects_nll(tau_hat, y, x, s, reml)
+    scale = s.mean() + y.std()
+    intervals = {}
+    for level in levels:
+        threshold = 0.5 * stats.chi2.ppf(level, 1)
+
+        def excess(tau):
+            return profile_random_effects_nll(tau, y, x, s, reml) - nll_min - threshold
+
+        lower = 0.0 if excess(0.0) <= 0 else optimize.brentq(excess, 0.0, tau_hat, xtol=xtol)
+        upper = optimize.brentq(excess, *_expand_bracket(excess, tau_hat, max(2 * tau_hat, scale)),
+                                xtol=xtol)
+        intervals[level] = (lower, upper)
+    return intervals
+
+
+def fit_random_effects_profile(y, x, s, reml=False, levels=(0.68, 0.95), xtol=1e-12):
+    """
+    Fit (θ, τ) by a 1-D root find of the profile score in τ.
+
+    θ is profiled out in closed form, so the fit is a bracketed Brent root
+    find of d NLL_p/dτ on O(n) array reductions: deterministic and well
+    under a millisecond for tens of points. τ̂ = 0 when the profile is
+    non-decreasing at τ = 0.
+
+    Parameters
+    ----------
+    y, x, s : array
+        Observations, design values and measurement errors
+    reml : bool
+        Restricted (REML) estimate of τ instead of the MLE
+    levels : tuple of float
+        Levels of the profile-likelihood intervals for τ
+    xtol : float
+        Absolute tolerance on τ
+
+    Returns
+    -------
+    dict
+        As fit_random_effects (standard errors from the observed
+        information at the estimate), plus 'tau_interval' ({level: (lower,
+        upper)} profile-likelihood intervals) and 'reml'
+    """
+    y, x, s = (np.asarray(a, dtype=float) for a in (y, x, s))
+
+    def score(tau):
+        return _profile_score(tau, y, x, s, reml)
+
+    nfev = 1
+    if score(0.0) >= 0:
+        tau = 0.0
+    else:
+        bracket = _expand_bracket(score, 0.0, s.mean() + y.std())
+        tau, result = optimize.brentq(score, *bracket, xtol=xtol, full_output=True)
+        nfev += result.function_calls
+
+    theta = _profile_terms(tau, y, x, s)[0]
+    log_tau = np.log(tau) if tau > 0 else -np.inf
+    params = np.array([theta, log_tau])
+
+    return {
+        'theta': theta,
+        'tau': tau,
+        'log_tau': log_tau,
+        **observed_information_errors(params, y, x, s),
+        'nll': random_effects_nll(params, y, x, s),
+        'nfev': nfev,
+        'success': True,
+        'tau_interval': profile_tau_interval(y, x, s, tau, levels, reml, xtol),
+        'reml': reml
+    }
+
+# -----------------------------------------------------------------------------
+# Grid posterior: exact (θ, τ) posterior on a dense grid
+# -----------------------------------------------------------------------------
+
+def _uniform_log_prior(tau, scale):
+    return np.zeros_like(tau)
+
+
+def _half_cauchy_log_prior(tau, scale):
+    return -np.log1p((tau / scale)**2)
+
+
+def _half_normal_log_prior(tau, scale):
+    return -0.5 * (tau / scale)**2
+
+
+# log π(τ) up to a constant; the flat prior on θ is implicit
+TAU_PRIORS = {
+    'uniform': _uniform_log_prior,
+    'half-cauchy': _half_cauchy_log_prior,
+    'half-normal': _half_normal_log_prior
+}
+
+
+def grid_summary(grid, density, levels=(0.68, 0.95)):
+    """
+    Mean, standard deviation, median, mode and equal-tailed credible
+    intervals of a 1-D density tabulated on a grid.
+
+    Returns
+    -------
+    dict
+        'grid', 'density' (normalized), 'mean', 'std', 'median', 'mode' and
+        'intervals' ({level: (lower, upper)})
+    """
+    density = density / integrate.trapezoid(density, grid)
+    cdf = np.concatenate([[0.0], np.cumsum(0.5 * (density[1:] + density[:-1]) * np.diff(grid))])
+    cdf /= cdf[-1]
+    mean = integrate.trapezoid(grid * density, grid)
+    return {
+        'grid': grid,
+        'density': density,
+        'mean': mean,
+        'std': np.sqrt(integrate.trapezoid((grid - mean)**2 * density, grid)),
+        'median': np.interp(0.5, cdf, grid),
+        'mode': grid[np.argmax(density)],
+        'intervals': {level: (np.interp(0.5 - 0.5 * level, cdf, grid),
+                              np.interp(0.5 + 0.5 * level, cdf, grid)) for level in levels}
+    }
+
+
+def random_effects_grid_posterior(y, x, s, theta_grid, tau_grid, tau_prior='uniform',
+                                  prior_scale=None, levels=(0.68, 0.95)):
+    """
+    Exact posterior of (θ, τ) on a dense grid, flat prior on θ.
+
+    For each τ the likelihood is Gaussian in θ with mean θ̂(τ) and
+    precision F(τ) = Σ x²/v, so
+
+        log L(θ, τ) = −NLL_p(τ) − ½ F(τ) (θ − θ̂(τ))²
+
+    and the whole (θ, τ) grid is one broadcast over per-τ sums (identical
+    to evaluating every grid point × galaxy, at O(n·N_τ + N_θ·N_τ) cost).
+
+    Parameters
+    ----------
+    y, x, s : array
+        (n,) observations, design values and measurement errors
+    theta_grid : array
+        (N_θ,) θ grid (also the range of the flat θ prior)
+    tau_grid : array
+        (N_τ,) τ grid, τ ≥ 0 (the range of the τ prior)
+    tau_prior : str or callable
+        Key of TAU_PRIORS ('uniform', 'half-cauchy', 'half-normal') or a
+        function (tau, scale) -> log π(τ)
+    prior_scale : float, optional
+        Scale of the half-Cauchy/half-normal prior (default: median s)
+    levels : tuple of float
+        Credible levels
+
+    Returns
+    -------
+    dict
+        'log_posterior' ((N_θ, N_τ), normalized on the grid), and
+        'theta' and 'tau' marginal summaries (see grid_summary)
+    """
+    y, x, s = (np.asarray(a, dtype=float) for a in (y, x, s))
+    theta_grid = np.asarray(theta_grid, dtype=float)
+    tau_grid = np.asarray(tau_grid, dtype=float)
+    log_prior = TAU_PRIORS[tau_prior] if isinstance(tau_prior, str) else tau_prior
+    prior_scale = np.median(s) if prior_scale is None else prior_scale
+
+    inv_var = 1.0 / (s**2 + tau_grid[:, np.newaxis]**2)
+    fisher = inv_var @ x**2
+    theta_hat = (inv_var @ (x * y)) / fisher
+    chi2_min = inv_var @ y**2 - theta_hat**2 * fisher
+    nll_profile = 0.5 * (y.size * np.log(2 * np.pi) - np.log(inv_var).sum(axis=1) + chi2_min)
+
+    log_post = (log_prior(tau_grid, prior_scale) - nll_profile
+                - 0.5 * fisher * (theta_grid[:, np.newaxis] - theta_hat)**2)
+    log_post -= log_post.max()
+    posterior = np.exp(log_post)
+    norm = integrate.trapezoid(integrate.trapezoid(posterior, tau_grid, axis=1), theta_grid)
+
+    return {
+        'theta_grid': theta_grid,
+        'tau_grid': tau_grid,
+        'log_posterior': log_post - np.log(norm),
+        'theta': grid_summary(theta_grid, integrate.trapezoid(posterior, tau_grid, axis=1), levels),
+        'tau': grid_summary(tau_grid, integrate.trapezoid(posterior, theta_grid, axis=0), levels)
+    }
+
+
+def _log_grid_floor(marginal, tail_mass):
+    """
+    Smallest τ > 0 the log-τ grid must reach so that at most tail_mass of
+    the marginal lies below it (the density is ~constant near the lower
+    grid edge, so the mass below τ is at most τ·max density there).
+    """
+    grid, density = marginal['grid'], marginal['density']
+    if grid[0] > 0:
+        return grid[0]
+    edge_density = density[:2].max()
+    return min(grid[1], tail_mass / edge_density) if edge_density > 0 else grid[1]
+
+
+def _mass_below(marginal, tau):
+    """Probability mass of a tabulated τ marginal below tau (trapezoid rule)."""
+    grid, density = marginal['grid'], marginal['density']
+    cdf = integrate.cumulative_trapezoid(density, grid, initial=0)
+    return float(np.interp(tau, grid, cdf / cdf[-1]))
+
+
+def scatter_ratio_posterior(numerator, denominator, n_points=4096, levels=(0.68, 0.95),
+                            tail_mass=1e-4):
+    """
+    Posterior of a ratio of independent scatters τ_num / τ_den.
+
+    On a common uniform log-τ grid, log R = log τ_num − log τ_den, so its
+    density is the cross-correlation of the two log-τ densities, computed
+    in one FFT convolution.
+
+    Marginals tabulated from τ = 0 (e.g. τ̂ on the boundary) carry mass on
+    [0, τ₁] that maps to arbitrarily large (denominator) or small
+    (numerator) ratios; the log grid is extended below τ₁ until at most
+    tail_mass per marginal is left out, so the ratio tails are kept.
+
+    Parameters
+    ----------
+    numerator, denominator : dict
+        τ marginal summaries ('grid', 'density'), e.g.
+        random_effects_grid_posterior(...)['tau']
+    n_points : int
+        Points of the common log-τ grid
+    levels : tuple of float
+        Credible levels
+    tail_mass : float
+        Target mass per marginal below the log-grid floor
+
+    Returns
+    -------
+    dict
+        grid_summary of R (on a log-spaced ratio grid), plus
+        'prob_greater_than_one' P(R > 1) and 'discarded_mass'
+        (numerator, denominator) mass below the grid floor (a
+        RuntimeWarning is issued when either exceeds 10·tail_mass)
+
+    Agrees with Monte Carlo draws from the two marginals when the
+    denominator sample (CCHP JAGB vs TRGB) has τ̂ = 0:
+
+    >>> tau_grid = np.linspace(0.0, 0.4, 1000)
+    >>> def tau_marginal(y, s):
+    ...     return random_effects_grid_posterior(y, np.ones(y.size), s, np.linspace(-0.4, 0.4, 800),
+    ...                                          tau_grid)['tau']
+    >>> den = tau_marginal(np.array([0.057, 0.018, -0.041, 0.048, -0.041, -0.061, -0.037]),
+    ...                    np.array([0.062, 0.079, 0.106, 0.062, 0.082, 0.080, 0.063]))
+    >>> num = tau_marginal(np.array([-0.21, 0.12, 0.05, -0.09, 0.16, -0.02, 0.08]), np.full(7, 0.05))
+    >>> result = scatter_ratio_posterior(num, den)
+    >>> rng = np.random.default_rng(0)
+    >>> def draw(marginal, n):
+    ...     cdf = integrate.cumulative_trapezoid(marginal['density'], marginal['grid'], initial=0)
+    ...     return np.interp(rng.random(n), cdf / cdf[-1], marginal['grid'])
+    >>> mc = draw(num, 10**6) / draw(den, 10**6)
+    >>> bool(np.allclose(result['intervals'][0.95], np.percentile(mc, [2.5, 97.5]), rtol=0.03))
+    True
+    >>> bool(np.allclose(result['intervals'][0.68], np.percentile(mc, [16, 84]), rtol=0.01))
+    True
+    """
+    marginals = (numerator, denominator)
+    tau_min = min(_log_grid_floor(m, tail_mass) for m in marginals)
+    tau_max = max(m['grid'][-1] for m in marginals)
+    log_grid = np.linspace(np.log(tau_min), np.log(tau_max), n_points)
+    step = log_grid[1] - log_grid[0]
+
+    discarded_mass = tuple(_mass_below(m, tau_min) for m in marginals)
+    if max(discarded_mass) > 10 * tail_mass:
+        warnings.warn(f"Scatter-ratio posterior ignores τ mass {max(discarded_mass):.2g} below "
+                      f"τ = {tau_min:.3g}; the ratio tails are truncated", RuntimeWarning)
+
+    # Densities in log τ: p(log τ) = τ·p(τ)
+    tau = np.exp(log_grid)
+    log_densities = [tau * np.interp(tau, m['grid'], m['density'], left=0.0, right=0.0)
+                     for m in marginals]
+
+    log_ratio_density = np.clip(signal.fftconvolve(log_densities[0], log_densities[1][::-1]),
+                                0.0, None) * step
+    log_ratio = (np.arange(log_ratio_density.size) - (n_points - 1)) * step
+
+    ratio = np.exp(log_ratio)
+    summary = grid_summary(ratio, log_ratio_density / ratio, levels)
+    summary['prob_greater_than_one'] = (
+        integrate.trapezoid(log_ratio_density[log_ratio >= 0], log_ratio[log_ratio >= 0])
+        / integrate.trapezoid(log_ratio_density, log_ratio))
+    summary['discarded_mass'] = discarded_mass
+    return summary
+
+
+def random_effects_log_posterior_batch(params, y, x, s, tau_max=np.inf):
+    """
+    Log-posterior for many parameter vectors at once.
+
+    Priors are flat in θ and flat in τ on (0, tau_max); in the (θ, log τ)
+    parameterization this adds the Jacobian log τ.
+
+    Parameters
+    ----------
+    params : array
+        (m, 2) rows of [θ, log τ]
+    y, x, s : array
+        (n,) observations, design values and measurement errors
+    tau_max : float
+        Upper bound of the flat τ prior
+
+    Returns
+    -------
+    ndarray
+        (m,) log-posterior (up to a constant); -inf outside the prior
+    """
+    params = np.atleast_2d(params)
+    theta = params[:, 0:1]
+    log_tau = params[:, 1]
+    total_var = s**2 + np.exp(2 * log_tau)[:, np.newaxis]
+    log_like = -0.5 * np.sum(np.log(2 * np.pi * total_var) + (y - theta * x)**2 / total_var,
+                             axis=1)
+    return np.where(log_tau < np.log(tau_max), log_like + log_tau, -np.inf)
+
+
+def sample_random_effects_posterior(y, x, s, params_init, n_walkers=32, n_steps=2000,
+                                    burn=500, thin=1, rng=None, tau_max=np.inf):
+    """
+    Ensemble-MCMC posterior of (θ, τ), started around the MLE.
+
+    Parameters
+    ----------
+    y, x, s : array
+        Observations, design values and measurement errors
+    params_init : array
+        Starting [θ, log τ] for the MLE search
+    n_walkers, n_steps : int
+        Ensemble size and number of steps (draws = n_walkers · n_steps)
+    burn, thin : int
+        Steps discarded as burn-in, and thinning of the kept steps
+    rng : np.random.Generator, optional
+        Random generator
+    tau_max : float
+        Upper bound of the flat τ prior
+
+    Returns
+    -------
+    dict
+        'theta' and 'tau' flattened posterior samples, 'chain'
+        ((n_steps, n_walkers, 2) in (θ, log τ)), 'log_prob' and
+        'acceptance_fraction'
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    y, x, s = (np.asarray(a, dtype=float) for a in (y, x, s))
+
+    # Start near the MLE, keeping walkers off the τ = 0 boundary
+    mle = fit_random_effects(y, x, s, params_init)
+    tau_floor = 0.1 * np.median(s)
+    center = [mle['theta'], np.log(max(mle['tau'], tau_floor))]
+    scale = [mle['se_theta'], 0.1]
+    initial = initialize_walkers(center, scale, n_walkers, rng)
+
+    result = sample_ensemble(
+        lambda p: random_effects_log_posterior_batch(p, y, x, s, tau_max),
+        initial, n_steps, rng=rng)
+
+    samples = flatten_chain(result['chain'], burn, thin)
+    return {
+        'theta': samples[:, 0],
+        'tau': np.exp(samples[:, 1]),
+        **result
+    }
+
+# -----------------------------------------------------------------------------
+# Grouped model: one τ_g per group (e.g. per survey)
+# -----------------------------------------------------------------------------
+
+def _grouped_terms(params, y, x, s, codes):
+    theta = params[0]
+    tau_sq = np.exp(2 * np.asarray(params[1:]))
+    tau_sq_i = tau_sq[codes]
+    inv_var = 1.0 / (s**2 + tau_sq_i)
+    r = y - theta * x
+    return tau_sq, tau_sq_i, inv_var, r
+
+
+def grouped_random_effects_nll(params, y, x, s, codes):
+    """
+    Negative log-likelihood with one intrinsic scatter per group.
+
+    y_i ~ N(θ·x_i, s_i² + τ²_g(i)), parameters [θ, log τ_1, ..., log τ_G]
+
+    Parameters
+    ----------
+    params : array
+        [θ, log τ_1, ..., log τ_G]
+    y, x, s : array
+        Observations, design values and measurement errors
+    codes : array of int
+        Group index g(i) ∈ [0, G) of every observation
+
+    Returns
+    -------
+    float
+        Negative log-likelihood
+    """
+    _, _, inv_var, r = _grouped_terms(params, y, x, s, codes)
+    return 0.5 * np.sum(-np.log(inv_var) + np.log(2 * np.pi) + r**2 * inv_var)
+
+
+def grouped_random_effects_gradient(params, y, x, s, codes):
+    """
+    Analytic gradient of grouped_random_effects_nll (bincount reductions).
+
+    Returns
+    -------
+    ndarray
+        (G + 1,) gradient
+    """
+    tau_sq, _, inv_var, r = _grouped_terms(params, y, x, s, codes)
+    per_group = np.bincount(codes, weights=inv_var - (r * inv_var)**2, minlength=tau_sq.size)
+    return np.concatenate([[-np.sum(x * r * inv_var)], tau_sq * per_group])
+
+
+def grouped_random_effects_hessian(params, y, x, s, codes):
+    """
+    Analytic Hessian of grouped_random_effects_nll.
+
+    Different groups share no observations, so the log τ block is diagonal.
+
+    Returns
+    -------
+    ndarray
+        (G + 1, G + 1) Hessian
+    """
+    tau_sq, tau_sq_i, inv_var, r = _grouped_terms(params, y, x, s, codes)
+    n_groups = tau_sq.size
+    r_sq_inv_var = r**2 * inv_var
+
+    hessian = np.zeros((n_groups + 1, n_groups + 1))
+    hessian[0, 0] = np.sum(x**2 * inv_var)
+    cross = 2 * tau_sq * np.bincount(codes, weights=x * r * inv_var**2, minlength=n_groups)
+    hessian[0, 1:] = hessian[1:, 0] = cross
+    diag = np.bincount(codes, minlength=n_groups,
+                       weights=2 * tau_sq_i * inv_var * (1 - r_sq_inv_var)
+                       + 2 * tau_sq_i**2 * inv_var**2 * (2 * r_sq_inv_var - 1))
+    hessian[np.arange(1, n_groups + 1), np.arange(1, n_groups + 1)] = diag
+    return hessian
+
+
+def grouped_observed_information_errors(params, y, x, s, codes):
+    """
+    Covariance of (θ, τ_1, ..., τ_G) from the observed information matrix.
+
+    Groups whose τ_g is on the τ = 0 boundary are held fixed: their rows
+    and columns are dropped before inversion and reported as NaN.
+
+    Returns
+    -------
+    dict
+        'se_theta', 'se_tau' ((G,) array), 'cov' ((G+1, G+1) covariance of
+        (θ, τ_1, ..., τ_G)) and 'boundary' ((G,) bool)
+    """
+    hessian = grouped_random_effects_hessian(params, y, x, s, codes)
+    tau = np.exp(np.asarray(params[1:]))
+    n_groups = tau.size
+
+    # Per-group median error from one sort (empty groups: inf, so held on the boundary)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.cumsum(np.bincount(codes, minlength=n_groups))[:-1]
+    median_error = np.array([np.median(group) if group.size else np.inf
+                             for group in np.split(np.asarray(s)[order], bounds)])
+    boundary = tau < TAU_BOUNDARY_FRACTION * median_error
+    free = np.concatenate([[True], ~boundary])
+
+    cov = np.full((n_groups + 1, n_groups + 1), np.nan)
+    jacobian = np.concatenate([[1.0], tau])[free]  # d(θ, τ)/d(θ, log τ)
+    sub = hessian[np.ix_(free, free)]
+    try:
+        np.linalg.cholesky(sub)
+        cov[np.ix_(free, free)] = jacobian[:, np.newaxis] * np.linalg.inv(sub) * jacobian
+    except np.linalg.LinAlgError:
+        cov[0, 0] = 1.0 / hessian[0, 0]
+
+    return {
+        'se_theta': np.sqrt(cov[0, 0]),
+        'se_tau': np.sqrt(np.diag(cov)[1:]),
+        'cov': cov,
+        'boundary': boundary
+    }
+
+
+def fit_grouped_random_effects(y, x, s, codes, params_init, method='L-BFGS-B', tol=1e-9):
+    """
+    Maximum-likelihood fit of θ and one τ per group with analytic derivatives.
+
+    Parameters
+    ----------
+    y, x, s : array
+        Observations, design values and measurement errors
+    codes : array of int
+        Group index of every observation
+    params_init : array
+        Starting [θ, log τ_1, ..., log τ_G]
+    method : str
+        Gradient-based method (GRADIENT_METHODS) or 'Nelder-Mead'
+    tol : float
+        Optimizer tolerance
+
+    Returns
+    -------
+    dict
+        'theta', 'tau' ((G,) array), 'se_theta', 'se_tau', 'cov',
+        'boundary', 'nll', 'nfev' and 'success'
+    """
+    y, x, s = (np.asarray(a, dtype=float) for a in (y, x, s))
+    codes = np.asarray(codes, dtype=np.intp)
+    args = (y, x, s, codes)
+
+    if method == 'Nelder-Mead':
+        result = optimize.minimize(grouped_random_effects_nll, params_init, args=args,
+                                   method='Nelder-Mead',
+                                   options={'xatol': tol, 'fatol': tol, 'maxiter': 100_000})
+    elif method in GRADIENT_METHODS:
+        hess = grouped_random_effects_hessian if method in ('trust-exact', 'Newton-CG') else None
+        options = {
+            'L-BFGS-B': {'gtol': tol, 'ftol': tol * 1e-5},
+            'Newton-CG': {'xtol': tol}
+        }.get(method, {'gtol': tol})
+        result = optimize.minimize(grouped_random_effects_nll, params_init, args=args,
+                                   method=method, jac=grouped_random_effects_gradient,
+                                   hess=hess, options=options)
+    else:
+        raise ValueError(f"Unknown method '{method}' (choose from "
+                         f"{GRADIENT_METHODS + ('Nelder-Mead',)})")
+
+    errors = grouped_observed_information_errors(result.x, *args)
+
+    return {
+        'theta': result.x[0],
+        'tau': np.exp(result.x[1:]),
+        **errors,
+        'nll': result.fun,
+        'nfev': result.nfev,
+        'success': result.success
+    }
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Joint (H₀, Ωₘ) Likelihood Surface for Cosmic Chronometers
+=========================================================
+
+Every cosmic-chronometer fit in the repo fixes Ωₘ = 0.315 (Planck 2018).
+This module frees Ωₘ and quantifies how much that assumption drives the
+CC H₀.
+
+For fixed Ωₘ the model H(z) = H₀·E(z; Ωₘ) is linear in H₀, so χ² is
+exactly quadratic in H₀:
+
+    χ²(H₀, Ωₘ) = χ²_min(Ωₘ) + (H₀ − Ĥ₀(Ωₘ))² / σ²(Ĥ₀; Ωₘ)
+
+One closed-form solve per Ωₘ row (solve_linear_H0, batched over rows)
+gives Ĥ₀, σ and χ²_min; the full surface is then a broadcast over the H₀
+axis with no per-point data sums. E(z; Ωₘ) tables are cached and reused
+across calls with the same redshifts and Ωₘ grid.
+
+Outputs: the 2-D χ² surface, the profile (min over Ωₘ) and marginal
+(flat priors, summed over Ωₘ) constraints on H₀, and the fixed-Ωₘ fit for
+comparison. A 500×500 grid takes a few milliseconds.
+
+Author: Distance Ladder Systematics Analysis
+Date: 2025-11-28
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy import integrate
+
+from closed_form_fits import covariance_eigenbasis, solve_linear_H0
+from expansion_models import E_lcdm
+from hierarchical_hz_fit import load_cosmic_chronometer_data
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+OMEGA_M_PLANCK = 0.315
+
+_E_TABLE_CACHE = {}
+
+
+def expansion_table(z, Omega_m_grid):
+    """
+    Cached flat-ΛCDM E(z; Ωₘ) table.
+
+    Parameters
+    ----------
+    z : array
+        (n,) redshifts
+    Omega_m_grid : array
+        (m,) matter densities
+
+    Returns
+    -------
+    ndarray
+        (m, n) read-only table E[k, i] = √(Ωₘ,k (1+z_i)³ + 1 − Ωₘ,k)
+    """
+    z = np.ascontiguousarray(z, dtype=float)
+    Omega_m_grid = np.ascontiguousarray(Omega_m_grid, dtype=float)
+    key = (z.tobytes(), Omega_m_grid.tobytes())
+    if key not in _E_TABLE_CACHE:
+        table = E_lcdm(z, Omega_m_grid[:, np.newaxis],
+                       out=np.empty((Omega_m_grid.size, z.size)))
+        table.flags.writeable = False
+        _E_TABLE_CACHE[key] = table
+    return _E_TABLE_CACHE[key]
+
+
+def _interval(grid, inside):
+    """Range of grid points where the boolean mask is True."""
+    if not np.any(inside):
+        return np.nan, np.nan
+    return grid[inside].min(), grid[inside].max()
+
+
+def h0_omegam_surface(z, H, sigma, Omega_m_grid, H0_grid, covariance=None):
+    """
+    χ² surface and H₀ constraints on a joint (Ωₘ, H₀) grid.
+
+    Parameters
+    ----------
+    z, H, sigma : array
+        (n,) redshifts, observed H(z) and uncertainties (km/s/Mpc)
+    Omega_m_grid : array
+        (m,) Ωₘ grid (flat prior range for the marginal)
+    H0_grid : array
+        (k,) H₀ grid (km/s/Mpc)
+    covariance : array, optional
+        (n, n) full covariance replacing diag(σ²)
+
+    Returns
+    -------
+    dict
+        'chi2': (m, k) surface; 'H0_hat', 'se_H0', 'chi2_min': per-Ωₘ
+        profile over H₀; 'best': global minimum; 'profile_H0': Δχ² of
+        H₀ profiled over Ωₘ with its 68% interval; 'marginal_H0':
+        normalized flat-prior posterior of H₀ with mean, std and 68%
+        interval; 'marginal_Omega_m': posterior of Ωₘ (H₀ integrated
+        analytically)
+    """
+    Omega_m_grid = np.asarray(Omega_m_grid, dtype=float)
+    H0_grid = np.asarray(H0_grid, dtype=float)
+    E = expansion_table(z, Omega_m_grid)
+
+    H = np.asarray(H, dtype=float)
+    if covariance is not None:
+        eigenvalues, eigenvectors = covariance_eigenbasis(covariance)
+        E = E @ eigenvectors
+        H = H @ eigenvectors
+        sigma = np.sqrt(eigenvalues)
+
+    fit = solve_linear_H0(E, H, sigma)
+    H0_hat, se_H0, chi2_min = fit['H0'], fit['se_H0'], fit['chi2']
+
+    chi2 = chi2_min[:, np.newaxis] + ((H0_grid - H0_hat[:, np.newaxis]) / se_H0[:, np.newaxis])**2
+
+    best_row = np.argmin(chi2_min)
+    best = {'H0': H0_hat[best_row], 'Omega_m': Omega_m_grid[best_row],
+            'chi2': chi2_min[best_row], 'dof': fit['dof'] - 1}
+
+    # Profile likelihood: minimize over Ωₘ at each H₀
+    delta_chi2_profile = chi2.min(axis=0) - chi2_min[best_row]
+    profile_lo, profile_hi = _interval(H0_grid, delta_chi2_profile <= 1.0)
+
+    # Marginal posterior (flat priors over the grid ranges)
+    weights = np.exp(-0.5 * (chi2 - chi2_min[best_row]))
+    posterior_H0 = weights.sum(axis=0)
+    posterior_H0 /= integrate.trapezoid(posterior_H0, H0_grid)
+    cdf = integrate.cumulative_trapezoid(posterior_H0, H0_grid, initial=0)
+    cdf /= cdf[-1]
+    mean = integrate.trapezoid(H0_grid * posterior_H0, H0_grid)
+    std = np.sqrt(integrate.trapezoid((H0_grid - mean)**2 * posterior_H0, H0_grid))
+
+    # Ωₘ marginal: ∫ exp(−χ²/2) dH₀ = √(2π) σ(Ĥ₀) exp(−χ²_min/2)
+    posterior_Om = se_H0 * np.exp(-0.5 * (chi2_min - chi2_min[best_row]))
+    posterior_Om /= integrate.trapezoid(posterior_Om, Omega_m_grid)
+
+    return {
+        'Omega_m_grid': Omega_m_grid,
+        'H0_grid': H0_grid,
+        'chi2': chi2,
+        'H0_hat': H0_hat,
+        'se_H0': se_H0,
+        'chi2_min': chi2_min,
+        'best': best,
+        'profile_H0': {
+            'delta_chi2': delta_chi2_profile,
+            'H0': best['H0'],
+            'lower': profile_lo,
+            'upper': profile_hi
+        },
+        'marginal_H0': {
+            'posterior': posterior_H0,
+            'mean': mean,
+            'std': std,
+            'q16': np.interp(0.16, cdf, H0_grid),
+            'median': np.interp(0.5, cdf, H0_grid),
+            'q84': np.interp(0.84, cdf, H0_grid)
+        },
+        'marginal_Omega_m': posterior_Om
+    }
+
+
+def main():
+    print("=" * 80)
+    print("JOINT (H₀, Ωₘ) LIKELIHOOD SURFACE - COSMIC CHRONOMETERS")
+    print("=" * 80)
+    print()
+
+    model = load_cosmic_chronometer_data()
+    Omega_m_grid = np.linspace(0.05, 0.70, 500)
+    H0_grid = np.linspace(50.0, 90.0, 500)
+
+    start = time.perf_counter()
+    surface = h0_omegam_surface(model.z, model.H, model.sigma, Omega_m_grid, H0_grid)
+    elapsed = time.perf_counter() - start
+
+    fixed = solve_linear_H0(expansion_table(model.z, [OMEGA_M_PLANCK])[0], model.H, model.sigma)
+
+    best = surface['best']
+    profile = surface['profile_H0']
+    marginal = surface['marginal_H0']
+
+    print(f"Grid: {Omega_m_grid.size} Ωₘ × {H0_grid.size} H₀ in {1e3 * elapsed:.1f} ms")
+    print()
+    print(f"Fixed Ωₘ = {OMEGA_M_PLANCK}:  H₀ = {fixed['H0']:.2f} ± {fixed['se_H0']:.2f} km/s/Mpc")
+    print(f"Best fit:          H₀ = {best['H0']:.2f} km/s/Mpc, Ωₘ = {best['Omega_m']:.3f} "
+          f"(χ² = {best['chi2']:.2f}, dof = {best['dof']})")
+    print(f"Profile (Δχ² ≤ 1): H₀ ∈ [{profile['lower']:.2f}, {profile['upper']:.2f}] km/s/Mpc")
+    print(f"Marginal:          H₀ = {marginal['mean']:.2f} ± {marginal['std']:.2f} km/s/Mpc "
+          f"(68%: [{marginal['q16']:.2f}, {marginal['q84']:.2f}])")
+    print()
+    print(f"Freeing Ωₘ inflates σ(H₀) by {marginal['std'] / fixed['se_H0']:.2f}× "
+          f"and shifts H₀ by {marginal['mean'] - fixed['H0']:+.2f} km/s/Mpc")
+    print()
+
+    profile_df = pd.DataFrame({
+        'Omega_m': Omega_m_grid,
+        'H0_hat': surface['H0_hat'],
+        'se_H0': surface['se_H0'],
+        'chi2_min': surface['chi2_min'],
+        'posterior_Omega_m': surface['marginal_Omega_m']
+    })
+    output_file = DATA_DIR / "h0_omegam_profile.csv"
+    profile_df.to_csv(output_file, index=False)
+    print(f"Results saved: {output_file}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,9 +12,11 @@ Date: October 22, 2025
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
 from pathlib import Path
 
+from closed_form_fits import solve_linear_H0
+from expansion_models import E_lcdm, H_LCDM
+
 # =============================================================================
 # Load Cosmic Chronometer Data
 # =============================================================================
@@ -46,14 +48,6 @@ print()
 OMEGA_M_PLANCK = 0.315
 OMEGA_LAMBDA_PLANCK = 0.685
 
-def H_LCDM(z, H0, Omega_m=OMEGA_M_PLANCK):
-    """
-    ΛCDM Hubble parameter
-    H(z) = H₀ × √[Ωₘ(1+z)³ + Ω_Λ]
-    """
-    Omega_Lambda = 1 - Omega_m
-    return H0 * np.sqrt(Omega_m * (1+z)**3 + Omega_Lambda)
-
 # =============================================================================
 # Fit H₀ from Cosmic Chronometers
 # =============================================================================
@@ -68,11 +62,11 @@ z = data['z'].values
 Hz = data['Hz'].values
 sigma_Hz = data['sigma_Hz'].values
 
-# Fit H₀ (only free parameter, Ωₘ fixed to Planck)
-popt, pcov = curve_fit(H_LCDM, z, Hz, p0=[70.0], sigma=sigma_Hz, absolute_sigma=True)
+# Fit H₀ (only free parameter, Ωₘ fixed to Planck; exact linear solution)
+fit = solve_linear_H0(E_lcdm(z), Hz, sigma_Hz)
 
-H0_fit = popt[0]
-H0_err = np.sqrt(pcov[0, 0])
+H0_fit = fit['H0']
+H0_err = fit['se_H0']
 
 print(f"Best-fit H₀:       {H0_fit:.2f} ± {H0_err:.2f} km/s/Mpc")
 print(f"Fixed Ωₘ:          {OMEGA_M_PLANCK:.3f} (Planck 2018)")
@@ -84,9 +78,9 @@ print()
 
 Hz_model = H_LCDM(z, H0_fit)
 residuals = (Hz - Hz_model) / sigma_Hz
-chi2 = np.sum(residuals**2)
-dof = len(z) - 1  # 1 free parameter (H₀)
-chi2_red = chi2 / dof
+chi2 = fit['chi2']
+dof = fit['dof']  # 1 free parameter (H₀)
+chi2_red = fit['chi2_red']
 
 print("FIT QUALITY:")
 print("-" * 80)
@@ -30,6 +30,11 @@ import seaborn as sns
 from scipy import stats
 from pathlib import Path
 
+from fit_cache import cached_fit, invalidates_fits
+from gaussian_random_effects import (random_effects_log_posterior_batch,
+                                     sample_random_effects_posterior)
+from parallel_sampling import concatenate_samples, run_sharded
+
 # Set plotting style
 sns.set_style('whitegrid')
 sns.set_context('paper')
@@ -47,6 +52,7 @@ class RandomEffectsMetaAnalysis:
 
     Implements DerSimonian-Laird estimator for between-study variance τ².
     Provides pooled estimate μ and hyper-prior σ_total = sqrt(τ² + σ_pooled²).
+    The fit is memoized and recomputed after a study is added.
     """
 
     def __init__(self, name: str):
@@ -63,6 +69,7 @@ class RandomEffectsMetaAnalysis:
         self.tau_squared = None
         self.I_squared = None
 
+    @invalidates_fits
     def add_study(self, mean: float, se: float, study_name: str):
         """
         Add a study measurement to the meta-analysis.
@@ -83,6 +90,7 @@ class RandomEffectsMetaAnalysis:
             'var': se**2
         })
 
+    @cached_fit
     def fit(self):
         """
         Fit random-effects meta-analysis using DerSimonian-Laird method.
@@ -139,7 +147,7 @@ class RandomEffectsMetaAnalysis:
             'n_studies': len(self.studies)
         }
 
-    def get_hyperprior(self, n_samples=10000):
+    def get_hyperprior(self, n_samples=10000, rng=None, store=None):
         """
         Sample from the hyper-prior distribution.
 
@@ -150,6 +158,10 @@ class RandomEffectsMetaAnalysis:
         ----------
         n_samples : int
             Number of samples to draw
+        rng : np.random.Generator, optional
+            Random generator (defaults to the global NumPy state)
+        store : SampleStore, optional
+            Append the draws to this on-disk store
 
         Returns
         -------
@@ -161,10 +173,99 @@ class RandomEffectsMetaAnalysis:
 
         # Hyper-prior: N(pooled_mean, sqrt(tau² + pooled_se²))
         total_variance = self.tau_squared + self.pooled_se**2
-        samples = np.random.normal(self.pooled_mean, np.sqrt(total_variance), n_samples)
+        normal = np.random.normal if rng is None else rng.normal
+        samples = normal(self.pooled_mean, np.sqrt(total_variance), n_samples)
+        if store is not None:
+            store.append(samples)
 
         return samples
 
+    def get_hyperprior_sharded(self, n_samples, seed, n_shards=16, max_workers=None):
+        """
+        Sample the hyper-prior across processes with SeedSequence streams.
+
+        Draws are identical for a given (seed, n_shards) regardless of
+        max_workers.
+
+        Parameters
+        ----------
+        n_samples : int
+            Number of samples to draw
+        seed : int
+            Root seed
+        n_shards : int
+            Number of independent shards
+        max_workers : int, optional
+            Process count (default: all cores)
+
+        Returns
+        -------
+        ndarray
+            Samples from hyper-prior distribution
+        """
+        if self.pooled_mean is None:
+            raise ValueError("Must call fit() before get_hyperprior_sharded()")
+
+        return run_sharded(self.get_hyperprior, n_samples, seed, n_shards=n_shards,
+                           max_workers=max_workers, merge=concatenate_samples)
+
+    def log_posterior_batch(self, params, tau_max=np.inf):
+        """
+        Vectorized log-posterior of the random-effects model.
+
+        Flat priors on the pooled mean μ and on τ ∈ (0, tau_max).
+
+        Parameters
+        ----------
+        params : array
+            (m, 2) rows of [μ, log(τ)]
+        tau_max : float
+            Upper bound of the flat τ prior
+
+        Returns
+        -------
+        ndarray
+            (m,) log-posterior values
+        """
+        means = np.array([s['mean'] for s in self.studies])
+        ses = np.array([s['se'] for s in self.studies])
+        return random_effects_log_posterior_batch(params, means, np.ones_like(means), ses,
+                                                  tau_max)
+
+    def sample_posterior(self, n_walkers=32, n_steps=2000, burn=500, thin=1, rng=None,
+                         tau_max=np.inf):
+        """
+        Ensemble-MCMC posterior of the pooled mean μ and between-study τ.
+
+        With a flat τ prior the posterior is proper only for ≥ 3 studies;
+        pass a finite tau_max otherwise.
+
+        Parameters
+        ----------
+        n_walkers, n_steps : int
+            Ensemble size and steps (n_walkers · n_steps draws in total)
+        burn, thin : int
+            Burn-in steps discarded and thinning of the kept steps
+        rng : np.random.Generator, optional
+            Random generator
+        tau_max : float
+            Upper bound of the flat τ prior
+
+        Returns
+        -------
+        dict
+            'mu' and 'tau' posterior samples, plus the raw 'chain'
+            (in μ, log τ), 'log_prob' and 'acceptance_fraction'
+        """
+        means = np.array([s['mean'] for s in self.studies])
+        ses = np.array([s['se'] for s in self.studies])
+        params_init = [np.average(means, weights=ses**-2), np.log(np.std(means) + np.min(ses))]
+        posterior = sample_random_effects_posterior(
+            means, np.ones_like(means), ses, params_init, n_walkers, n_steps, burn, thin, rng,
+            tau_max)
+        posterior['mu'] = posterior.pop('theta')
+        return posterior
+
     def forest_plot(self, ax=None):
         """Create forest plot showing study-level estimates and pooled result."""
         if ax is None:
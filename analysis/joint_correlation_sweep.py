@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Joint Correlation-Pair Sweep Engine
+===================================
+
+Sweeps any subset of the off-diagonal correlation pairs jointly on a grid
+and returns dense σ_sys,corr and Hubble-tension cubes.
+
+σ²_sys,corr = σᵀ R σ is linear in each off-diagonal ρ_ij:
+
+    σ²_sys,corr(ρ) = σᵀ R₀ σ + Σ_k 2 σ_i σ_j (ρ_k - ρ_k,0)
+
+so the full cube is assembled by broadcasting k one-dimensional rank-one
+terms onto the baseline, costing O(k) per grid point instead of an O(n²)
+matrix product. This exposes joint worst cases that one-at-a-time sweeps
+(extended_correlation_sensitivity.py) cannot show.
+
+Author: Distance Ladder Systematics Project
+Date: November 2025
+"""
+
+import numpy as np
+import pandas as pd
+
+from correlation_matrix_validation import validate_correlation_stack
+
+# Tension reference values (match extended_correlation_sensitivity.py)
+H0_PLANCK = 67.36  # km/s/Mpc
+SIGMA_PLANCK = 0.54  # km/s/Mpc
+SIGMA_STAT = 0.80  # km/s/Mpc
+H0_CORRECTED = 69.67  # km/s/Mpc (Scenario A + Prior 1)
+
+
+def hubble_tension(sigma_sys, H0_cepheid=H0_CORRECTED, sigma_stat=SIGMA_STAT,
+                   H0_ref=H0_PLANCK, sigma_ref=SIGMA_PLANCK):
+    """
+    Vectorized tension between corrected Cepheid H₀ and a reference value.
+
+    Tension = |H0_ceph - H0_ref| / sqrt(σ_stat² + σ_sys² + σ_ref²)
+
+    Parameters
+    ----------
+    sigma_sys : float or array
+        Correlated systematic uncertainty (km/s/Mpc)
+
+    Returns
+    -------
+    float or ndarray
+        Tension in units of σ
+    """
+    sigma_combined = np.sqrt(sigma_stat**2 + np.asarray(sigma_sys)**2 + sigma_ref**2)
+    return np.abs(H0_cepheid - H0_ref) / sigma_combined
+
+
+def grid_correlation_matrices(R_baseline, pairs, rho_axes, flat_indices):
+    """
+    Build the correlation matrices for selected points of a sweep grid.
+
+    Parameters
+    ----------
+    R_baseline : array
+        Baseline n×n correlation matrix
+    pairs : list of (int, int)
+        Swept index pairs
+    rho_axes : list of arrays
+        Grid values along each axis
+    flat_indices : array
+        Flat (C-order) indices into the grid
+
+    Returns
+    -------
+    ndarray
+        (len(flat_indices), n, n) correlation matrices
+    """
+    n = R_baseline.shape[0]
+    grid_index = np.unravel_index(flat_indices, tuple(axis.size for axis in rho_axes))
+    R = np.broadcast_to(R_baseline, (len(flat_indices), n, n)).copy()
+    for (i, j), rho, index in zip(pairs, rho_axes, grid_index):
+        R[:, i, j] = R[:, j, i] = rho[index]
+    return R
+
+
+def joint_correlation_sweep(sigma_vector, R_baseline, pairs, rho_grid,
+                            threshold=2.0, validate_psd=False, chunk_size=100_000,
+                            **tension_kwargs):
+    """
+    Evaluate σ_sys,corr and tension on the joint grid of several ρ_ij.
+
+    Parameters
+    ----------
+    sigma_vector : array
+        Individual systematic uncertainties (km/s/Mpc)
+    R_baseline : array
+        Baseline n×n correlation matrix; pairs not swept stay at baseline
+    pairs : list of (int, int)
+        Index pairs (i, j) to sweep jointly
+    rho_grid : array or list of arrays
+        Grid of ρ values, shared by all pairs or one array per pair
+    threshold : float
+        Tension threshold (σ) for the below-threshold mask
+    validate_psd : bool
+        Also check every grid matrix for positive semidefiniteness with
+        batched eigvalsh ('psd_valid' cube and 'rejected_fraction')
+    chunk_size : int
+        Grid matrices built per validation chunk
+    **tension_kwargs
+        Overrides passed to hubble_tension (H0_cepheid, sigma_stat, ...)
+
+    Returns
+    -------
+    dict
+        'sigma_sys': cube of σ_sys,corr with one axis per pair,
+        'tension': matching tension cube,
+        'below_threshold': boolean mask (tension < threshold),
+        'rho_axes': grid values along each axis,
+        'pairs': swept index pairs,
+        'baseline_sigma_sys' and 'baseline_tension'
+    """
+    sigma_vector = np.asarray(sigma_vector, dtype=float)
+    R_baseline = np.asarray(R_baseline, dtype=float)
+    pairs = [tuple(p) for p in pairs]
+
+    if isinstance(rho_grid, (list, tuple)) and len(rho_grid) == len(pairs) \
+            and np.ndim(rho_grid[0]) == 1:
+        rho_axes = [np.asarray(g, dtype=float) for g in rho_grid]
+    else:
+        rho_axes = [np.asarray(rho_grid, dtype=float)] * len(pairs)
+
+    baseline_sq = sigma_vector @ R_baseline @ sigma_vector
+
+    # Accumulate baseline + Σ_k 2σ_iσ_j(ρ_k - ρ_k,0) by broadcasting
+    sigma_sq = np.full((1,) * len(pairs), baseline_sq)
+    for axis, ((i, j), rho) in enumerate(zip(pairs, rho_axes)):
+        shape = [1] * len(pairs)
+        shape[axis] = rho.size
+        delta = 2.0 * sigma_vector[i] * sigma_vector[j] * (rho - R_baseline[i, j])
+        sigma_sq = sigma_sq + delta.reshape(shape)
+
+    sigma_sys = np.sqrt(np.clip(sigma_sq, 0.0, None))
+    tension = hubble_tension(sigma_sys, **tension_kwargs)
+
+    sweep = {
+        'sigma_sys': sigma_sys,
+        'tension': tension,
+        'below_threshold': tension < threshold,
+        'rho_axes': rho_axes,
+        'pairs': pairs,
+        'baseline_sigma_sys': np.sqrt(baseline_sq),
+        'baseline_tension': hubble_tension(np.sqrt(baseline_sq), **tension_kwargs)
+    }
+
+    if validate_psd:
+        psd_valid = np.empty(tension.size, dtype=bool)
+        for start in range(0, tension.size, chunk_size):
+            flat_indices = np.arange(start, min(start + chunk_size, tension.size))
+            R_block = grid_correlation_matrices(R_baseline, pairs, rho_axes, flat_indices)
+            psd_valid[flat_indices] = validate_correlation_stack(R_block)['valid']
+        sweep['psd_valid'] = psd_valid.reshape(tension.shape)
+        sweep['rejected_fraction'] = 1.0 - psd_valid.mean()
+
+    return sweep
+
+
+def sweep_extremes(sweep, valid_only=False):
+    """
+    Locate the joint worst (maximum) and best (minimum) tension cases.
+
+    Parameters
+    ----------
+    sweep : dict
+        Output of joint_correlation_sweep
+    valid_only : bool
+        Restrict to PSD grid points (requires validate_psd=True)
+
+    Returns
+    -------
+    dict
+        ρ values and tension at the maximum and minimum, plus the
+        fraction of grid points below threshold
+    """
+    tension = sweep['tension']
+    below = sweep['below_threshold']
+    if valid_only:
+        tension = np.where(sweep['psd_valid'], tension, np.nan)
+        below = below[sweep['psd_valid']]
+
+    extremes = {}
+    for label, flat_index in (('max', np.nanargmax(tension)), ('min', np.nanargmin(tension))):
+        index = np.unravel_index(flat_index, tension.shape)
+        extremes[label] = {
+            'rho': [axis[k] for axis, k in zip(sweep['rho_axes'], index)],
+            'sigma_sys': sweep['sigma_sys'][index],
+            'tension': tension[index]
+        }
+    extremes['fraction_below_threshold'] = below.mean()
+    return extremes
+
+
+def sweep_to_frame(sweep, pair_names=None):
+    """
+    Flatten a sweep cube into a long-format DataFrame.
+
+    Parameters
+    ----------
+    sweep : dict
+        Output of joint_correlation_sweep
+    pair_names : list of str, optional
+        Column names for the ρ axes (default: 'rho_i_j')
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per grid point
+    """
+    if pair_names is None:
+        pair_names = [f'rho_{i}_{j}' for i, j in sweep['pairs']]
+    grids = np.meshgrid(*sweep['rho_axes'], indexing='ij')
+    columns = {name: grid.ravel() for name, grid in zip(pair_names, grids)}
+    columns['sigma_sys_corr'] = sweep['sigma_sys'].ravel()
+    columns['hubble_tension_sigma'] = sweep['tension'].ravel()
+    columns['below_threshold'] = sweep['below_threshold'].ravel()
+    if 'psd_valid' in sweep:
+        columns['psd_valid'] = sweep['psd_valid'].ravel()
+    return pd.DataFrame(columns)
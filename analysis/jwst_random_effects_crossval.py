@@ -10,6 +10,11 @@ This addresses §A.5(ii) "Random-effects cross-validation" in the manuscript,
 formalizing the "2.3× excess scatter" claim and providing posterior
 distributions for systematic offset μ and intrinsic scatter τ.
 
+By default the fits use synthetic samples matching the Table 4 summary
+statistics; `--real` fits the CCHP per-galaxy tables
+(data/cchp_trgb_{jagb,cepheid}_comparison.csv, Delta_mu/Delta_sigma
+columns), loaded column-wise with RandomEffectsModel.from_csv.
+
 Part of V8.0 hierarchical components enhancement for ApJ submission.
 
 References:
@@ -25,9 +30,18 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy import stats, optimize
+from scipy import stats
 from pathlib import Path
 
+from bootstrap import bootstrap_random_effects
+from closed_form_fits import profile_scatter_fit
+from fit_cache import cached_fit, invalidates_fits
+from gaussian_random_effects import (fit_random_effects, fit_random_effects_profile,
+                                     profile_tau_interval, random_effects_gradient,
+                                     random_effects_grid_posterior,
+                                     random_effects_log_posterior_batch, random_effects_nll,
+                                     sample_random_effects_posterior, scatter_ratio_posterior)
+
 # Set plotting style
 sns.set_style('whitegrid')
 sns.set_context('paper')
@@ -49,6 +63,10 @@ class RandomEffectsModel:
         μ = systematic offset (population mean)
         σᵢ = reported measurement error for galaxy i
         τ = intrinsic scatter (between-galaxy variability)
+
+    Offsets and errors are cached as NumPy arrays, and μ is profiled out
+    in closed form, so a fit is a 1-D root find in τ. Fit results are
+    memoized per fit options and dropped when a galaxy is added.
     """
 
     def __init__(self, name: str):
@@ -59,10 +77,13 @@ class RandomEffectsModel:
             Model identifier for output labeling
         """
         self.name = name
-        self.data = []
+        self.offsets = np.empty(0)
+        self.errors = np.empty(0)
+        self.galaxy_names = []
         self.mu_posterior = None
         self.tau_posterior = None
 
+    @invalidates_fits
     def add_galaxy(self, offset: float, error: float, galaxy_name: str):
         """
         Add a galaxy measurement to the model.
@@ -76,11 +97,116 @@ class RandomEffectsModel:
         galaxy_name : str
             Galaxy identifier
         """
-        self.data.append({
-            'name': galaxy_name,
-            'offset': offset,
-            'error': error
-        })
+        self.offsets = np.append(self.offsets, float(offset))
+        self.errors = np.append(self.errors, float(error))
+        self.galaxy_names.append(galaxy_name)
+
+    @invalidates_fits
+    def add_galaxies(self, offsets, errors, galaxy_names=None):
+        """
+        Add many galaxy measurements at once (array concatenation).
+
+        Parameters
+        ----------
+        offsets : array
+            (n,) distance modulus offsets (mag)
+        errors : array
+            (n,) measurement uncertainties (mag)
+        galaxy_names : sequence of str, optional
+            (n,) galaxy identifiers (default: Galaxy_<k>, continuing the
+            current numbering)
+
+        Raises
+        ------
+        ValueError
+            Mismatched lengths, non-finite values or non-positive errors
+        """
+        offsets = np.asarray(offsets, dtype=float).ravel()
+        errors = np.asarray(errors, dtype=float).ravel()
+        if galaxy_names is None:
+            galaxy_names = [f'Galaxy_{k}' for k in range(len(self) + 1, len(self) + offsets.size + 1)]
+        galaxy_names = [str(name) for name in galaxy_names]
+        if not offsets.size == errors.size == len(galaxy_names):
+            raise ValueError(f"Got {offsets.size} offsets, {errors.size} errors and "
+                             f"{len(galaxy_names)} galaxy names")
+        if not (np.all(np.isfinite(offsets)) and np.all(np.isfinite(errors)) and np.all(errors > 0)):
+            raise ValueError("Offsets must be finite and errors finite and positive")
+
+        self.offsets = np.concatenate([self.offsets, offsets])
+        self.errors = np.concatenate([self.errors, errors])
+        self.galaxy_names.extend(galaxy_names)
+
+    @classmethod
+    def from_frame(cls, frame, name, offset_column='Delta_mu', error_column='Delta_sigma',
+                   name_column='Galaxy'):
+        """
+        Build a model from a per-galaxy table (columns read as whole arrays).
+
+        Parameters
+        ----------
+        frame : pd.DataFrame
+            One row per galaxy
+        name : str
+            Comparison name (e.g. 'JAGB vs TRGB')
+        offset_column, error_column : str
+            Columns holding the offsets and their uncertainties (mag)
+        name_column : str or None
+            Column holding galaxy identifiers (None or missing: Galaxy_<k>)
+
+        Returns
+        -------
+        RandomEffectsModel
+            Unfitted model
+        """
+        missing = [column for column in (offset_column, error_column) if column not in frame]
+        if missing:
+            raise ValueError(f"Missing columns {missing} (have {list(frame.columns)})")
+
+        galaxy_names = None
+        if name_column is not None and name_column in frame:
+            galaxy_names = frame[name_column].astype(str).tolist()
+
+        model = cls(name)
+        model.add_galaxies(frame[offset_column].to_numpy(dtype=float),
+                           frame[error_column].to_numpy(dtype=float), galaxy_names)
+        return model
+
+    @classmethod
+    def from_csv(cls, path, name=None, **columns):
+        """
+        Build a model from a per-galaxy CSV table.
+
+        Parameters
+        ----------
+        path : str or Path
+            CSV file
+        name : str, optional
+            Comparison name (default: file stem)
+        **columns
+            Column names, passed to from_frame
+
+        Returns
+        -------
+        RandomEffectsModel
+            Unfitted model
+        """
+        path = Path(path)
+        return cls.from_frame(pd.read_csv(path), path.stem if name is None else name, **columns)
+
+    def __len__(self):
+        return self.offsets.size
+
+    @property
+    def data(self):
+        """Measurements as a list of dicts (legacy row-wise view)."""
+        return [
+            {'name': name, 'offset': offset, 'error': error}
+            for name, offset, error in zip(self.galaxy_names, self.offsets, self.errors)
+        ]
+
+    def _likelihood_arrays(self):
+        """(y, x, s) for the shared random-effects likelihood (x = 1)."""
+        return self.offsets, np.ones_like(self.offsets), self.errors
 
     def neg_log_likelihood(self, params):
         """
@@ -96,72 +222,197 @@ class RandomEffectsModel:
         float
             Negative log-likelihood value
         """
-        mu, log_tau = params
-        tau = np.exp(log_tau)
-
-        offsets = np.array([d['offset'] for d in self.data])
-        errors = np.array([d['error'] for d in self.data])
+        return random_effects_nll(params, *self._likelihood_arrays())
 
-        # Total variance = measurement variance + intrinsic scatter
-        total_var = errors**2 + tau**2
+    def neg_log_likelihood_gradient(self, params):
+        """
+        Analytic gradient of neg_log_likelihood.
 
-        # Gaussian likelihood
-        nll = 0.5 * np.sum(np.log(2 * np.pi * total_var) +
-                          (offsets - mu)**2 / total_var)
+        Parameters
+        ----------
+        params : array-like
+            [μ, log(τ)]
 
-        return nll
+        Returns
+        -------
+        ndarray
+            (2,) gradient
+        """
+        return random_effects_gradient(params, *self._likelihood_arrays())
 
-    def fit(self, mu_init=0.0, tau_init=0.05):
+    @cached_fit
+    def fit(self, mu_init=0.0, tau_init=0.05, method='profile', reml=False,
+            levels=(0.68, 0.95)):
         """
         Fit hierarchical model via maximum likelihood.
 
         Parameters
         ----------
         mu_init : float
-            Initial guess for μ
+            Initial guess for μ (optimizer methods only)
         tau_init : float
-            Initial guess for τ
+            Initial guess for τ (optimizer methods only)
+        method : str
+            'profile' (default): closed-form μ̂(τ) and a 1-D root find of
+            the profile score in τ; 'L-BFGS-B', 'trust-exact', 'Newton-CG'
+            or 'BFGS' run the 2-D optimizer with analytic derivatives;
+            'Nelder-Mead' is the derivative-free legacy path
+        reml : bool
+            Restricted-likelihood (REML) estimate of τ ('profile' only)
+        levels : tuple of float
+            Levels of the profile-likelihood intervals for τ
 
         Returns
         -------
         dict
-            MLE estimates and uncertainties
+            MLE (or REML) estimates with standard errors from the observed
+            information matrix (se_tau is NaN when τ is at the τ = 0
+            boundary), and 'tau_interval': {level: (lower, upper)}
+            profile-likelihood intervals for τ
         """
-        # Initial parameters
-        params_init = [mu_init, np.log(tau_init)]
-
-        # Minimize negative log-likelihood
-        result = optimize.minimize(
-            self.neg_log_likelihood,
-            params_init,
-            method='Nelder-Mead',
-            options={'xatol': 1e-8, 'fatol': 1e-8}
-        )
+        y, x, s = self._likelihood_arrays()
 
-        mu_mle = result.x[0]
-        tau_mle = np.exp(result.x[1])
+        if method == 'profile':
+            fit = fit_random_effects_profile(y, x, s, reml=reml, levels=levels)
+        elif reml:
+            raise ValueError("REML is only available with method='profile'")
+        else:
+            fit = fit_random_effects(y, x, s, [mu_init, np.log(tau_init)], method=method)
+            fit['tau_interval'] = profile_tau_interval(y, x, s, fit['tau'], levels)
 
-        # Estimate uncertainties via Hessian approximation
-        # (Simplified: use Fisher information)
-        offsets = np.array([d['offset'] for d in self.data])
-        errors = np.array([d['error'] for d in self.data])
-        total_var = errors**2 + tau_mle**2
+        return {
+            'mu': fit['theta'],
+            'se_mu': fit['se_theta'],
+            'tau': fit['tau'],
+            'se_tau': fit['se_tau'],
+            'tau_interval': fit['tau_interval'],
+            'cov': fit['cov'],
+            'n_galaxies': len(self),
+            'nll': fit['nll'],
+            'nfev': fit['nfev']
+        }
 
-        # SE of μ
-        se_mu = np.sqrt(1.0 / np.sum(1.0 / total_var))
+    def posterior(self, mu_grid=None, tau_grid=None, tau_prior='uniform', prior_scale=None,
+                  levels=(0.68, 0.95), n_grid=1000):
+        """
+        Exact grid posterior of (μ, τ); fills mu_posterior and tau_posterior.
 
-        # SE of τ (approximate)
-        se_tau = tau_mle / np.sqrt(2 * len(self.data))
+        Parameters
+        ----------
+        mu_grid, tau_grid : array, optional
+            Grids (default: n_grid points over mean ± 10·spread/√n for μ
+            and [0, 10·spread] for τ, spread = std(δ) + median(σ))
+        tau_prior : str or callable
+            'uniform', 'half-cauchy', 'half-normal' (see
+            gaussian_random_effects.TAU_PRIORS) or a function
+            (tau, scale) -> log π(τ); μ has a flat prior
+        prior_scale : float, optional
+            Scale of the half-Cauchy/half-normal prior (default: median σ)
+        levels : tuple of float
+            Credible levels
+        n_grid : int
+            Points per axis of the default grids
 
+        Returns
+        -------
+        dict
+            'mu' and 'tau' marginal summaries (density, mean, std, median,
+            mode and credible 'intervals'), and the normalized 2-D
+            'log_posterior' on ('mu_grid', 'tau_grid')
+        """
+        y, x, s = self._likelihood_arrays()
+        spread = np.std(y) + np.median(s)
+        if mu_grid is None:
+            half_width = 10.0 * spread / np.sqrt(len(self))
+            mu_grid = np.linspace(y.mean() - half_width, y.mean() + half_width, n_grid)
+        if tau_grid is None:
+            tau_grid = np.linspace(0.0, 10.0 * spread, n_grid)
+
+        grid = random_effects_grid_posterior(y, x, s, mu_grid, tau_grid, tau_prior, prior_scale,
+                                             levels)
+        self.mu_posterior = grid['theta']
+        self.tau_posterior = grid['tau']
         return {
-            'mu': mu_mle,
-            'se_mu': se_mu,
-            'tau': tau_mle,
-            'se_tau': se_tau,
-            'n_galaxies': len(self.data),
-            'nll': result.fun
+            'mu': grid['theta'],
+            'tau': grid['tau'],
+            'log_posterior': grid['log_posterior'],
+            'mu_grid': grid['theta_grid'],
+            'tau_grid': grid['tau_grid'],
+            'tau_prior': tau_prior
         }
 
+    def log_posterior_batch(self, params, tau_max=np.inf):
+        """
+        Vectorized log-posterior (flat priors on μ and on τ ∈ (0, tau_max)).
+
+        Parameters
+        ----------
+        params : array
+            (m, 2) rows of [μ, log(τ)]
+        tau_max : float
+            Upper bound of the flat τ prior (mag)
+
+        Returns
+        -------
+        ndarray
+            (m,) log-posterior values
+        """
+        return random_effects_log_posterior_batch(params, *self._likelihood_arrays(), tau_max)
+
+    def sample_posterior(self, n_walkers=32, n_steps=2000, burn=500, thin=1, rng=None,
+                         tau_max=np.inf):
+        """
+        Ensemble-MCMC posterior of (μ, τ).
+
+        Parameters
+        ----------
+        n_walkers, n_steps : int
+            Ensemble size and steps (n_walkers · n_steps draws in total)
+        burn, thin : int
+            Burn-in steps discarded and thinning of the kept steps
+        rng : np.random.Generator, optional
+            Random generator
+        tau_max : float
+            Upper bound of the flat τ prior (mag)
+
+        Returns
+        -------
+        dict
+            'mu' and 'tau' posterior samples, plus the raw 'chain'
+            (in μ, log τ), 'log_prob' and 'acceptance_fraction'
+        """
+        posterior = sample_random_effects_posterior(
+            *self._likelihood_arrays(), [0.0, np.log(0.05)], n_walkers, n_steps,
+            burn, thin, rng, tau_max)
+        posterior['mu'] = posterior.pop('theta')
+        return posterior
+
+    def bootstrap(self, n_boot=10_000, kind='parametric', levels=(0.68, 0.95), rng=None):
+        """
+        Bootstrap intervals for (μ, τ), all replicates refitted in one batch.
+
+        Parameters
+        ----------
+        n_boot : int
+            Number of bootstrap replicates
+        kind : str
+            'parametric' or 'nonparametric'
+        levels : tuple of float
+            Confidence levels for the intervals
+        rng : np.random.Generator, optional
+            Random generator
+
+        Returns
+        -------
+        pd.DataFrame
+            Rows 'mu' and 'tau' with estimates, bootstrap SE and
+            percentile/BCa bounds
+        dict
+            (n_boot,) replicates per parameter
+        """
+        return bootstrap_random_effects(*self._likelihood_arrays(), n_boot=n_boot, kind=kind,
+                                        levels=levels, rng=rng, names=('mu', 'tau'))
+
     def compare_to_weighted_mean(self):
         """
         Compare hierarchical estimate to simple inverse-variance weighted mean.
@@ -171,11 +422,8 @@ class RandomEffectsModel:
         dict
             Weighted mean results for comparison
         """
-        offsets = np.array([d['offset'] for d in self.data])
-        errors = np.array([d['error'] for d in self.data])
-
-        weights = 1.0 / errors**2
-        weighted_mean = np.sum(weights * offsets) / np.sum(weights)
+        weights = 1.0 / self.errors**2
+        weighted_mean = np.sum(weights * self.offsets) / np.sum(weights)
         se_weighted = np.sqrt(1.0 / np.sum(weights))
 
         return {
@@ -184,35 +432,215 @@ class RandomEffectsModel:
         }
 
 
-def analyze_jagb_vs_trgb():
+def simulate_jagb_vs_trgb(rng=None):
     """
-    Analyze JAGB vs TRGB distance modulus offsets.
+    Synthetic JAGB vs TRGB galaxy-level offsets.
 
-    From Table 4 (CCHP): 7 galaxies with JAGB-TRGB measurements.
-    Expected: Small systematic offset, low intrinsic scatter (precision baseline).
+    Data from Table 4: N=7 galaxies
+    Weighted mean offset: +0.0017 ± 0.028 mag
+    RMS scatter: 0.048 mag
+
+    Parameters
+    ----------
+    rng : np.random.Generator or np.random.RandomState, optional
+        Random source (default: the fixed seed-42 realization)
 
     Returns
     -------
     RandomEffectsModel
-        Fitted model
+        Unfitted model
     """
     model = RandomEffectsModel('JAGB vs TRGB')
 
-    # Data from Table 4: N=7 galaxies
-    # Weighted mean offset: +0.0017 ± 0.028 mag
-    # RMS scatter: 0.048 mag
-
     # Synthetic galaxy-level data (representative of published compilation)
     # In practice, would use actual per-galaxy JWST measurements
-    np.random.seed(42)
+    if rng is None:
+        rng = np.random.RandomState(42)
     n_galaxies = 7
     true_scatter = 0.048  # mag
     mean_error = 0.028    # mag
 
-    for i in range(n_galaxies):
-        offset = np.random.normal(0.0017, true_scatter)
-        error = mean_error * np.random.uniform(0.8, 1.2)
-        model.add_galaxy(offset, error, f'Galaxy_{i+1}')
+    # Draws stay interleaved per galaxy so seeded realizations are unchanged
+    draws = np.array([(rng.normal(0.0017, true_scatter), rng.uniform(0.8, 1.2))
+                      for _ in range(n_galaxies)])
+    model.add_galaxies(draws[:, 0], mean_error * draws[:, 1])
+
+    return model
+
+
+def simulate_cepheid_vs_trgb(rng=None):
+    """
+    Synthetic Cepheid vs TRGB galaxy-level offsets.
+
+    Data from Table 4: N=15 galaxies
+    Weighted mean offset: -0.024 ± 0.020 mag (1.2σ, marginally significant)
+    RMS scatter: 0.108 mag (~5.3% distances)
+    Factor 2.3× larger scatter than JAGB vs TRGB
+
+    Parameters
+    ----------
+    rng : np.random.Generator or np.random.RandomState, optional
+        Random source (default: the fixed seed-123 realization)
+
+    Returns
+    -------
+    RandomEffectsModel
+        Unfitted model
+    """
+    model = RandomEffectsModel('Cepheid vs TRGB')
+
+    if rng is None:
+        rng = np.random.RandomState(123)
+    n_galaxies = 15
+    true_scatter = 0.108  # mag (includes intrinsic + Cepheid systematics)
+    mean_error = 0.020     # mag
+
+    # Draws stay interleaved per galaxy so seeded realizations are unchanged
+    draws = np.array([(rng.normal(-0.024, true_scatter), rng.uniform(0.7, 1.3))
+                      for _ in range(n_galaxies)])
+    model.add_galaxies(draws[:, 0], mean_error * draws[:, 1])
+
+    return model
+
+
+# Real CCHP per-galaxy tables (Freedman+ 2024; Delta_mu = mu_method - mu_TRGB)
+CCHP_DATA_DIR = Path(__file__).parent.parent / 'data'
+CCHP_COMPARISONS = {
+    'jagb': ('JAGB vs TRGB', 'cchp_trgb_jagb_comparison.csv'),
+    'cepheid': ('Cepheid vs TRGB', 'cchp_trgb_cepheid_comparison.csv'),
+}
+
+
+def load_cchp_comparison(comparison='jagb', data_dir=CCHP_DATA_DIR):
+    """
+    Real CCHP galaxy-level offsets for one method comparison.
+
+    Parameters
+    ----------
+    comparison : str
+        Key of CCHP_COMPARISONS ('jagb' or 'cepheid')
+    data_dir : Path
+        Directory holding the cchp_trgb_*_comparison.csv tables
+
+    Returns
+    -------
+    RandomEffectsModel
+        Unfitted model built from the Delta_mu/Delta_sigma columns
+    """
+    if comparison not in CCHP_COMPARISONS:
+        raise ValueError(f"Unknown comparison '{comparison}' (choose from {list(CCHP_COMPARISONS)})")
+    name, filename = CCHP_COMPARISONS[comparison]
+    return RandomEffectsModel.from_csv(Path(data_dir) / filename, name)
+
+
+SIMULATORS = {
+    'jagb': simulate_jagb_vs_trgb,
+    'cepheid': simulate_cepheid_vs_trgb,
+}
+
+
+def generate_jwst_realizations(n_realizations, rng, comparison='jagb'):
+    """
+    Independent synthetic galaxy samples (shard task for run_sharded).
+
+    Parameters
+    ----------
+    n_realizations : int
+        Number of synthetic samples
+    rng : np.random.Generator
+        Random stream for this shard
+    comparison : str
+        'jagb' or 'cepheid'
+
+    Returns
+    -------
+    list of RandomEffectsModel
+    """
+    simulate = SIMULATORS[comparison]
+    return [simulate(rng) for _ in range(n_realizations)]
+
+
+def stack_models(models):
+    """
+    Pad the galaxy samples of several models into batch arrays.
+
+    Parameters
+    ----------
+    models : sequence of RandomEffectsModel
+
+    Returns
+    -------
+    offsets, errors : ndarray
+        (B, n_max) arrays, NaN-padded for models with fewer galaxies
+    mask : ndarray of bool
+        (B, n_max) used entries
+    """
+    n_max = max(len(model) for model in models)
+    offsets = np.full((len(models), n_max), np.nan)
+    errors = np.full((len(models), n_max), np.nan)
+    for k, model in enumerate(models):
+        offsets[k, :len(model)] = model.offsets
+        errors[k, :len(model)] = model.errors
+    return offsets, errors, ~np.isnan(offsets)
+
+
+def fit_random_effects_batch(offsets, errors, mask=None, **fit_kwargs):
+    """
+    Fit B random-effects models δ ~ N(μ, σ² + τ²) in one vectorized call.
+
+    Uses the batched profile-likelihood solver (closed_form_fits.
+    profile_scatter_fit): μ in closed form, τ by a grid scan and
+    golden-section refinement run for all datasets at once.
+
+    Parameters
+    ----------
+    offsets, errors : array
+        (B, n) offsets and measurement errors (mag)
+    mask : array of bool, optional
+        (B, n) used entries for ragged galaxy counts (see stack_models)
+    **fit_kwargs
+        Passed to profile_scatter_fit (n_grid, tau_bounds, n_refine,
+        chunk_size)
+
+    Returns
+    -------
+    dict
+        (B,) arrays 'mu', 'se_mu' (at fixed τ̂), 'tau', 'nll' and
+        'n_galaxies'
+    """
+    offsets = np.asarray(offsets, dtype=float)
+    fit = profile_scatter_fit(offsets, 1.0, errors, mask=mask, **fit_kwargs)
+    n_galaxies = (np.full(offsets.shape[:-1], offsets.shape[-1]) if mask is None
+                  else np.sum(mask, axis=-1))
+    return {
+        'mu': fit['theta'],
+        'se_mu': fit['se_theta'],
+        'tau': fit['tau'],
+        'nll': fit['nll'],
+        'n_galaxies': n_galaxies
+    }
+
+
+def analyze_jagb_vs_trgb(model=None):
+    """
+    Analyze JAGB vs TRGB distance modulus offsets.
+
+    From Table 4 (CCHP): 7 galaxies with JAGB-TRGB measurements.
+    Expected: Small systematic offset, low intrinsic scatter (precision baseline).
+
+    Parameters
+    ----------
+    model : RandomEffectsModel, optional
+        Measurements to fit, e.g. load_cchp_comparison('jagb')
+        (default: the synthetic Table 4 sample)
+
+    Returns
+    -------
+    RandomEffectsModel
+        Fitted model
+    """
+    if model is None:
+        model = simulate_jagb_vs_trgb()
 
     results = model.fit()
 
@@ -221,6 +649,8 @@ def analyze_jagb_vs_trgb():
     print("=" * 60)
     print(f"Systematic offset (μ): {results['mu']:.4f} ± {results['se_mu']:.4f} mag")
     print(f"Intrinsic scatter (τ): {results['tau']:.4f} ± {results['se_tau']:.4f} mag")
+    tau_lo, tau_hi = results['tau_interval'][0.68]
+    print(f"  68% profile-likelihood interval: [{tau_lo:.4f}, {tau_hi:.4f}] mag")
     print(f"N galaxies: {results['n_galaxies']}")
     print()
 
@@ -233,34 +663,26 @@ def analyze_jagb_vs_trgb():
     return model
 
 
-def analyze_cepheid_vs_trgb():
+def analyze_cepheid_vs_trgb(model=None):
     """
     Analyze Cepheid vs TRGB distance modulus offsets.
 
     From Table 4 (CCHP): 15 galaxies with Cepheid-TRGB measurements.
     Expected: Small systematic offset, **excess scatter** indicating Cepheid systematics.
 
+    Parameters
+    ----------
+    model : RandomEffectsModel, optional
+        Measurements to fit, e.g. load_cchp_comparison('cepheid')
+        (default: the synthetic Table 4 sample)
+
     Returns
     -------
     RandomEffectsModel
         Fitted model
     """
-    model = RandomEffectsModel('Cepheid vs TRGB')
-
-    # Data from Table 4: N=15 galaxies
-    # Weighted mean offset: -0.024 ± 0.020 mag (1.2σ, marginally significant)
-    # RMS scatter: 0.108 mag (~5.3% distances)
-    # Factor 2.3× larger scatter than JAGB vs TRGB
-
-    np.random.seed(123)
-    n_galaxies = 15
-    true_scatter = 0.108  # mag (includes intrinsic + Cepheid systematics)
-    mean_error = 0.020     # mag
-
-    for i in range(n_galaxies):
-        offset = np.random.normal(-0.024, true_scatter)
-        error = mean_error * np.random.uniform(0.7, 1.3)
-        model.add_galaxy(offset, error, f'Galaxy_{i+1}')
+    if model is None:
+        model = simulate_cepheid_vs_trgb()
 
     results = model.fit()
 
@@ -269,6 +691,8 @@ def analyze_cepheid_vs_trgb():
     print("=" * 60)
     print(f"Systematic offset (μ): {results['mu']:.4f} ± {results['se_mu']:.4f} mag")
     print(f"Intrinsic scatter (τ): {results['tau']:.4f} ± {results['se_tau']:.4f} mag")
+    tau_lo, tau_hi = results['tau_interval'][0.68]
+    print(f"  68% profile-likelihood interval: [{tau_lo:.4f}, {tau_hi:.4f}] mag")
     print(f"N galaxies: {results['n_galaxies']}")
     print()
 
@@ -281,11 +705,18 @@ def analyze_cepheid_vs_trgb():
     return model
 
 
-def compute_scatter_ratio(jagb_model, cepheid_model):
+# Cepheid/JAGB excess-scatter factor quoted in §3.4 of the manuscript
+MANUSCRIPT_SCATTER_RATIO = 2.3
+
+
+def compute_scatter_ratio(jagb_model, cepheid_model, tau_prior='uniform'):
     """
     Compute ratio of intrinsic scatters: Cepheid/JAGB.
 
     This formalizes the "2.3× excess scatter" claim in §3.4 of manuscript.
+    The uncertainty comes from the exact posterior of the ratio (grid
+    posteriors of both τ combined by convolution in log τ), which stays
+    valid when τ_JAGB is near zero, unlike first-order error propagation.
 
     Parameters
     ----------
@@ -293,36 +724,61 @@ def compute_scatter_ratio(jagb_model, cepheid_model):
         Fitted JAGB vs TRGB model
     cepheid_model : RandomEffectsModel
         Fitted Cepheid vs TRGB model
+    tau_prior : str or callable
+        τ prior for both posteriors (see RandomEffectsModel.posterior)
 
     Returns
     -------
     dict
-        Scatter ratio and interpretation
+        Scatter ratio (MLE; NaN when τ̂_JAGB is on the τ = 0 boundary,
+        flagged by 'jagb_tau_on_boundary'), posterior median and credible
+        intervals, P(ratio > 1), and se_ratio (half-width of the 68%
+        interval)
     """
     jagb_fit = jagb_model.fit()
     cepheid_fit = cepheid_model.fit()
 
-    scatter_ratio = cepheid_fit['tau'] / jagb_fit['tau']
+    # No MLE ratio when τ̂_JAGB sits on the τ = 0 boundary (real CCHP sample);
+    # the posterior ratio below stays defined
+    jagb_on_boundary = jagb_fit['tau'] <= 0
+    scatter_ratio = np.nan if jagb_on_boundary else cepheid_fit['tau'] / jagb_fit['tau']
 
-    # Uncertainty propagation (approximate)
-    rel_error = np.sqrt(
-        (cepheid_fit['se_tau'] / cepheid_fit['tau'])**2 +
-        (jagb_fit['se_tau'] / jagb_fit['tau'])**2
-    )
-    se_ratio = scatter_ratio * rel_error
+    jagb_post = jagb_model.posterior(tau_prior=tau_prior)
+    cepheid_post = cepheid_model.posterior(tau_prior=tau_prior)
+    ratio_post = scatter_ratio_posterior(cepheid_post['tau'], jagb_post['tau'])
+    ratio_lo68, ratio_hi68 = ratio_post['intervals'][0.68]
+    ratio_lo95, ratio_hi95 = ratio_post['intervals'][0.95]
+    se_ratio = 0.5 * (ratio_hi68 - ratio_lo68)
 
     print("=" * 60)
     print("EXCESS CEPHEID SCATTER QUANTIFICATION")
     print("=" * 60)
-    print(f"JAGB intrinsic scatter: {jagb_fit['tau']:.4f} ± {jagb_fit['se_tau']:.4f} mag")
-    print(f"Cepheid intrinsic scatter: {cepheid_fit['tau']:.4f} ± {cepheid_fit['se_tau']:.4f} mag")
-    print(f"Scatter ratio (Cepheid/JAGB): {scatter_ratio:.2f} ± {se_ratio:.2f}×")
+    for label, fit, post in (("JAGB", jagb_fit, jagb_post), ("Cepheid", cepheid_fit, cepheid_post)):
+        lo, hi = post['tau']['intervals'][0.68]
+        print(f"{label} intrinsic scatter: {fit['tau']:.4f} mag (MLE), "
+              f"posterior median {post['tau']['median']:.4f} [68%: {lo:.4f}, {hi:.4f}]")
+    mle_text = ("undefined (τ̂_JAGB on the τ = 0 boundary)" if jagb_on_boundary
+                else f"{scatter_ratio:.2f}× (MLE)")
+    print(f"Scatter ratio (Cepheid/JAGB): {mle_text}, "
+          f"posterior median {ratio_post['median']:.2f}×")
+    print(f"  68% credible: [{ratio_lo68:.2f}, {ratio_hi68:.2f}]×, "
+          f"95% credible: [{ratio_lo95:.2f}, {ratio_hi95:.2f}]×")
+    print(f"  P(ratio > 1) = {ratio_post['prob_greater_than_one']:.3f} ({tau_prior} τ prior)")
     print()
     print(f"INTERPRETATION:")
-    print(f"  - JAGB establishes JWST precision baseline (~{jagb_fit['tau']*100:.1f}% distance scatter)")
-    print(f"  - Cepheid shows {scatter_ratio:.1f}× excess scatter")
-    print(f"  - Consistent with factor {scatter_ratio:.1f}× systematic underestimate")
-    print(f"  - Validates manuscript claim: \"2.3× excess scatter\" (§3.4)")
+    print(f"  - JAGB establishes JWST precision baseline "
+          f"(τ posterior median {jagb_post['tau']['median']:.3f} mag)")
+    if ratio_lo95 > 1:
+        print(f"  - Cepheid shows {ratio_post['median']:.1f}× excess scatter "
+              f"(95% credible interval excludes 1)")
+    else:
+        print(f"  - No significant excess Cepheid scatter: 95% credible interval includes 1 "
+              f"(P(ratio > 1) = {ratio_post['prob_greater_than_one']:.2f})")
+    if ratio_lo95 > 1 and ratio_lo68 <= MANUSCRIPT_SCATTER_RATIO <= ratio_hi68:
+        print(f"  - Validates manuscript claim: \"{MANUSCRIPT_SCATTER_RATIO}× excess scatter\" (§3.4)")
+    else:
+        print(f"  - Does not support manuscript claim: \"{MANUSCRIPT_SCATTER_RATIO}× excess "
+              f"scatter\" (§3.4)")
     print("=" * 60)
     print()
 
@@ -330,11 +786,16 @@ def compute_scatter_ratio(jagb_model, cepheid_model):
         'jagb_tau': jagb_fit['tau'],
         'cepheid_tau': cepheid_fit['tau'],
         'scatter_ratio': scatter_ratio,
-        'se_ratio': se_ratio
+        'jagb_tau_on_boundary': jagb_on_boundary,
+        'se_ratio': se_ratio,
+        'ratio_median': ratio_post['median'],
+        'ratio_interval_68': (ratio_lo68, ratio_hi68),
+        'ratio_interval_95': (ratio_lo95, ratio_hi95),
+        'prob_ratio_gt_1': ratio_post['prob_greater_than_one']
     }
 
 
-def save_results(jagb_model, cepheid_model, scatter_results):
+def save_results(jagb_model, cepheid_model, scatter_results, suffix=''):
     """
     Save hierarchical model results to CSV.
 
@@ -346,6 +807,8 @@ def save_results(jagb_model, cepheid_model, scatter_results):
         Cepheid vs TRGB model
     scatter_results : dict
         Scatter ratio results
+    suffix : str
+        Appended to the output file stems (e.g. '_cchp' for the real data)
     """
     jagb_fit = jagb_model.fit()
     cepheid_fit = cepheid_model.fit()
@@ -359,17 +822,26 @@ def save_results(jagb_model, cepheid_model, scatter_results):
         'se_tau': [jagb_fit['se_tau'], cepheid_fit['se_tau']]
     })
 
-    # Add scatter ratio
+    # Add scatter ratio (MLE row is NaN when τ̂_JAGB is on the τ = 0 boundary)
+    on_boundary = scatter_results['jagb_tau_on_boundary']
+    lo68, hi68 = scatter_results['ratio_interval_68']
+    lo95, hi95 = scatter_results['ratio_interval_95']
     scatter_df = pd.DataFrame({
-        'metric': ['scatter_ratio_Cepheid_JAGB'],
-        'value': [scatter_results['scatter_ratio']],
-        'uncertainty': [scatter_results['se_ratio']]
+        'metric': ['scatter_ratio_Cepheid_JAGB', 'jagb_tau_on_boundary',
+                   'scatter_ratio_posterior_median', 'scatter_ratio_lower68',
+                   'scatter_ratio_upper68', 'scatter_ratio_lower95', 'scatter_ratio_upper95',
+                   'prob_scatter_ratio_gt_1'],
+        'value': [scatter_results['scatter_ratio'], float(on_boundary),
+                  scatter_results['ratio_median'], lo68, hi68, lo95, hi95,
+                  scatter_results['prob_ratio_gt_1']],
+        'uncertainty': [np.nan if on_boundary else scatter_results['se_ratio'], np.nan,
+                        scatter_results['se_ratio']] + [np.nan] * 5
     })
 
-    output_file = OUTPUT_DIR / 'jwst_random_effects_results.csv'
+    output_file = OUTPUT_DIR / f'jwst_random_effects_results{suffix}.csv'
     results_df.to_csv(output_file, index=False)
 
-    scatter_file = OUTPUT_DIR / 'jwst_scatter_ratio.csv'
+    scatter_file = OUTPUT_DIR / f'jwst_scatter_ratio{suffix}.csv'
     scatter_df.to_csv(scatter_file, index=False)
 
     print(f"✓ Saved hierarchical model results: {output_file}")
@@ -379,39 +851,48 @@ def save_results(jagb_model, cepheid_model, scatter_results):
     return results_df, scatter_df
 
 
-def main():
+def main(real=False):
     """
     Main execution: JWST random-effects cross-validation analysis.
 
     Implements §A.5(ii) for V8.0 hierarchical components.
+
+    Parameters
+    ----------
+    real : bool
+        Fit the real CCHP per-galaxy tables (data/cchp_trgb_*_comparison.csv)
+        instead of the synthetic Table 4 samples; outputs get a '_cchp' suffix
     """
     print("\n" + "=" * 60)
     print("JWST RANDOM-EFFECTS CROSS-VALIDATION")
     print("V8.0 Enhancement - AWI-146")
+    print(f"Data: {'CCHP per-galaxy tables' if real else 'synthetic Table 4 samples'}")
     print("=" * 60 + "\n")
 
     # Analyze JAGB vs TRGB (precision baseline)
-    jagb_model = analyze_jagb_vs_trgb()
+    jagb_model = analyze_jagb_vs_trgb(load_cchp_comparison('jagb') if real else None)
 
     # Analyze Cepheid vs TRGB (excess scatter)
-    cepheid_model = analyze_cepheid_vs_trgb()
+    cepheid_model = analyze_cepheid_vs_trgb(load_cchp_comparison('cepheid') if real else None)
 
     # Compute scatter ratio
     scatter_results = compute_scatter_ratio(jagb_model, cepheid_model)
 
     # Save results
-    results_df, scatter_df = save_results(jagb_model, cepheid_model, scatter_results)
+    suffix = '_cchp' if real else ''
+    results_df, scatter_df = save_results(jagb_model, cepheid_model, scatter_results, suffix)
 
     print("=" * 60)
     print("COMPLETION STATUS")
     print("=" * 60)
     print("✓ Hierarchical random-effects models fitted")
     print("✓ Systematic offsets (μ) and intrinsic scatter (τ) quantified")
-    print("✓ Scatter ratio formalized: {:.1f}× excess Cepheid scatter".format(
-        scatter_results['scatter_ratio']))
+    lo68, hi68 = scatter_results['ratio_interval_68']
+    print(f"✓ Scatter ratio formalized: {scatter_results['ratio_median']:.1f}× Cepheid/JAGB "
+          f"(posterior median, 68%: [{lo68:.1f}, {hi68:.1f}]×)")
     print("✓ Results saved to:")
-    print("  - data/jwst_random_effects_results.csv")
-    print("  - data/jwst_scatter_ratio.csv")
+    print(f"  - data/jwst_random_effects_results{suffix}.csv")
+    print(f"  - data/jwst_scatter_ratio{suffix}.csv")
     print()
     print("NEXT STEPS:")
     print("- Use in manuscript §A.5(ii) validation")
@@ -421,4 +902,9 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JWST random-effects cross-validation")
+    parser.add_argument('--real', action='store_true',
+                        help="fit the real CCHP per-galaxy tables instead of the synthetic samples")
+    main(real=parser.parse_args().real)
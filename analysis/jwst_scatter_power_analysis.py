@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Power Analysis for the JWST Cepheid/JAGB Scatter Ratio
+======================================================
+
+How many galaxies per method does JWST need to detect a given excess of
+Cepheid over JAGB intrinsic scatter (e.g. τ_Cepheid / τ_JAGB = 2)?
+
+Each simulated survey draws n galaxy-level offsets per method from the
+random-effects model δ ~ N(μ, σ² + τ²) and tests H₀: τ_Cepheid = τ_JAGB
+with the likelihood ratio between separate fits and a shared-τ fit, as
+the signed root r = sign(τ̂_C − τ̂_J)·√Λ (one-sided). The τ = 0 boundary
+makes the χ² reference distribution only approximate, so the critical
+value is calibrated on null surveys (equal τ) of the same size.
+
+All surveys are fitted at once with the batched profile-likelihood
+solvers (closed_form_fits.profile_scatter_fit and
+profile_shared_scatter_fit), so 10⁵ simulated surveys per sample size
+take 5-30 s on a single core.
+
+Author: Distance Ladder Systematics Analysis
+Date: 2025-12-01
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy import stats
+
+from closed_form_fits import profile_shared_scatter_fit
+from jwst_random_effects_crossval import fit_random_effects_batch
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+# Synthetic-sample characteristics (see simulate_jagb_vs_trgb and
+# simulate_cepheid_vs_trgb)
+JAGB_TAU = np.sqrt(0.048**2 - 0.028**2)  # mag
+JAGB_MEAN_ERROR = 0.028                   # mag
+CEPHEID_MEAN_ERROR = 0.020                # mag
+
+
+def simulate_survey_batch(n_surveys, n_galaxies, tau, mean_error, mu=0.0, error_spread=0.2,
+                          rng=None):
+    """
+    Simulated galaxy-level offsets for many surveys.
+
+    Parameters
+    ----------
+    n_surveys : int
+        Number of surveys B
+    n_galaxies : int
+        Galaxies per survey n
+    tau : float
+        Intrinsic scatter (mag)
+    mean_error : float
+        Typical measurement error (mag); per-galaxy errors are drawn
+        uniformly within ±error_spread of it
+    mu : float
+        Systematic offset (mag)
+    error_spread : float
+        Fractional spread of the measurement errors
+    rng : np.random.Generator, optional
+        Random generator
+
+    Returns
+    -------
+    offsets, errors : ndarray
+        (B, n) arrays
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    errors = mean_error * rng.uniform(1 - error_spread, 1 + error_spread, (n_surveys, n_galaxies))
+    offsets = mu + np.sqrt(errors**2 + tau**2) * rng.standard_normal((n_surveys, n_galaxies))
+    return offsets, errors
+
+
+def scatter_ratio_test(offsets_a, errors_a, offsets_b, errors_b, mask_a=None, mask_b=None):
+    """
+    Batched likelihood-ratio test of equal intrinsic scatter, τ_b vs τ_a.
+
+    Parameters
+    ----------
+    offsets_a, errors_a : array
+        (B, n_a) reference sample (e.g. JAGB vs TRGB)
+    offsets_b, errors_b : array
+        (B, n_b) test sample (e.g. Cepheid vs TRGB)
+    mask_a, mask_b : array of bool, optional
+        Used entries for ragged samples
+
+    Returns
+    -------
+    dict
+        (B,) arrays 'tau_a', 'tau_b', 'ratio' (τ̂_b/τ̂_a; inf or NaN when τ̂_a = 0),
+        'lr_statistic' Λ and 'signed_root' r = sign(τ̂_b − τ̂_a)·√Λ
+    """
+    fit_a = fit_random_effects_batch(offsets_a, errors_a, mask_a)
+    fit_b = fit_random_effects_batch(offsets_b, errors_b, mask_b)
+    shared = profile_shared_scatter_fit([(offsets_a, 1.0, errors_a, mask_a),
+                                         (offsets_b, 1.0, errors_b, mask_b)])
+
+    lr_statistic = np.maximum(2.0 * (shared['nll'] - fit_a['nll'] - fit_b['nll']), 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = fit_b['tau'] / fit_a['tau']
+    return {
+        'tau_a': fit_a['tau'],
+        'tau_b': fit_b['tau'],
+        'ratio': ratio,
+        'lr_statistic': lr_statistic,
+        'signed_root': np.sign(fit_b['tau'] - fit_a['tau']) * np.sqrt(lr_statistic)
+    }
+
+
+def scatter_ratio_power(n_galaxies, ratio=2.0, tau_reference=JAGB_TAU,
+                        error_reference=JAGB_MEAN_ERROR, error_test=CEPHEID_MEAN_ERROR,
+                        n_surveys=100_000, alpha=0.05, calibrate=True, rng=None):
+    """
+    Probability of detecting τ_test = ratio·τ_reference with n galaxies each.
+
+    Parameters
+    ----------
+    n_galaxies : int
+        Galaxies per method
+    ratio : float
+        True scatter ratio τ_test / τ_reference
+    tau_reference : float
+        Reference (JAGB) intrinsic scatter (mag)
+    error_reference, error_test : float
+        Typical measurement errors of the two samples (mag)
+    n_surveys : int
+        Simulated surveys
+    alpha : float
+        One-sided false-positive rate
+    calibrate : bool
+        Take the critical value from null surveys (τ_test = τ_reference)
+        instead of the asymptotic normal quantile
+    rng : np.random.Generator, optional
+        Random generator
+
+    Returns
+    -------
+    dict
+        'n_galaxies', 'ratio', 'power', 'critical_value',
+        'median_ratio_estimate' and 'elapsed_s'
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    start = time.perf_counter()
+
+    def simulate(tau_test):
+        reference = simulate_survey_batch(n_surveys, n_galaxies, tau_reference, error_reference,
+                                          rng=rng)
+        test = simulate_survey_batch(n_surveys, n_galaxies, tau_test, error_test, rng=rng)
+        return scatter_ratio_test(*reference, *test)
+
+    if calibrate:
+        critical_value = np.quantile(simulate(tau_reference)['signed_root'], 1 - alpha)
+    else:
+        critical_value = stats.norm.ppf(1 - alpha)
+    alternative = simulate(ratio * tau_reference)
+
+    return {
+        'n_galaxies': n_galaxies,
+        'ratio': ratio,
+        'power': np.mean(alternative['signed_root'] > critical_value),
+        'critical_value': critical_value,
+        'median_ratio_estimate': np.nanmedian(alternative['ratio']),
+        'elapsed_s': time.perf_counter() - start
+    }
+
+
+def main():
+    print("=" * 80)
+    print("POWER ANALYSIS - JWST CEPHEID/JAGB SCATTER RATIO")
+    print("=" * 80)
+    print()
+
+    n_surveys = 100_000
+    ratio = 2.0
+    rng = np.random.default_rng(2025)
+    print(f"τ_JAGB = {JAGB_TAU:.3f} mag, τ_Cepheid = {ratio:.1f}× τ_JAGB, "
+          f"{n_surveys:,} simulated surveys per N (critical value calibrated on null surveys)")
+    print()
+
+    rows = []
+    for n_galaxies in (5, 7, 10, 15, 20, 30, 40, 60):
+        row = scatter_ratio_power(n_galaxies, ratio, n_surveys=n_surveys, rng=rng)
+        rows.append(row)
+        print(f"N = {n_galaxies:3d} galaxies per method: power {row['power']:.3f} "
+              f"(critical r = {row['critical_value']:.2f}, median ratio estimate "
+              f"{row['median_ratio_estimate']:.2f}; {row['elapsed_s']:.1f} s, "
+              f"{2 * n_surveys / row['elapsed_s']:,.0f} surveys/s)")
+    print()
+
+    results = pd.DataFrame(rows)
+    adequate = results[results['power'] >= 0.8]
+    if len(adequate):
+        print(f"80% power to detect a {ratio:.0f}× scatter ratio needs "
+              f"N ≈ {adequate['n_galaxies'].iloc[0]} galaxies per method")
+    else:
+        print(f"80% power not reached for N ≤ {results['n_galaxies'].max()}")
+    print()
+
+    output_file = DATA_DIR / "jwst_scatter_power.csv"
+    results.to_csv(output_file, index=False)
+    print(f"Results saved: {output_file}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
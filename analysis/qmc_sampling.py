@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Quasi-Monte Carlo Sampling Backend for Prior Propagation
+========================================================
+
+Low-discrepancy alternative to plain np.random draws for the Beta priors
+on correlation coefficients and σ-components. Scrambled Sobol (or Halton)
+points in the unit hypercube are pushed through the prior inverse CDFs,
+so percentile estimates converge close to 1/N instead of 1/√N.
+
+Samplers are stateful: successive draws continue the same sequence, so
+chunked/streaming propagation keeps the low-discrepancy property. Sobol
+sequences are best used with power-of-two block sizes.
+
+References:
+    - Owen 1998 (scrambled nets), Joe & Kuo 2008 (Sobol direction numbers)
+    - scipy.stats.qmc
+
+Author: Distance Ladder Systematics Analysis
+Date: 2025-11-21
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.stats import qmc
+
+SAMPLERS = ('mc', 'sobol', 'halton')
+
+
+def _qmc_engine(engine_cls, n_dims, rng):
+    """Scrambled QMC engine seeded from rng (SciPy ≥1.15 uses rng=)."""
+    try:
+        return engine_cls(n_dims, scramble=True, rng=rng)
+    except TypeError:
+        return engine_cls(n_dims, scramble=True, seed=rng)
+
+
+class UnitSampler:
+    """
+    Draws points in the unit hypercube [0, 1)^d.
+
+    'mc' uses the random generator directly; 'sobol' and 'halton' use
+    scrambled low-discrepancy sequences seeded from the same generator.
+    """
+
+    def __init__(self, n_dims, sampler='mc', rng=None):
+        """
+        Parameters
+        ----------
+        n_dims : int
+            Dimension of the hypercube
+        sampler : str
+            One of 'mc', 'sobol', 'halton'
+        rng : np.random.Generator, optional
+            Random generator (for 'mc', defaults to the global NumPy state)
+        """
+        if sampler not in SAMPLERS:
+            raise ValueError(f"Unknown sampler '{sampler}' (choose from {SAMPLERS})")
+        self.n_dims = n_dims
+        self.sampler = sampler
+        self.rng = rng
+        if sampler == 'sobol':
+            self._engine = _qmc_engine(qmc.Sobol, n_dims, rng)
+        elif sampler == 'halton':
+            self._engine = _qmc_engine(qmc.Halton, n_dims, rng)
+        else:
+            self._engine = None
+
+    def draw(self, n_samples):
+        """
+        Next n_samples points of the sequence.
+
+        Returns
+        -------
+        ndarray
+            (n_samples, n_dims) points in [0, 1)
+        """
+        if self._engine is not None:
+            return self._engine.random(n_samples)
+        if self.rng is None:
+            return np.random.random_sample((n_samples, self.n_dims))
+        return self.rng.random((n_samples, self.n_dims))
+
+
+def scaled_beta_ppf(u, priors):
+    """
+    Map unit-cube points through scaled Beta inverse CDFs.
+
+    Parameters
+    ----------
+    u : array
+        (N, k) points in [0, 1)
+    priors : list of (α, β, lower, width)
+        One scaled Beta prior per column: x = lower + width · Beta(α, β)
+
+    Returns
+    -------
+    ndarray
+        (N, k) prior draws
+    """
+    a, b, lower, width = (np.array(column, dtype=float) for column in zip(*priors))
+    return lower + width * stats.beta.ppf(u, a, b)
+
+
+def convergence_report(estimator, n_values, n_repeats=50, reference=None,
+                       reference_samples=2**20, samplers=SAMPLERS, seed=2025,
+                       speedup_keys=('median', 'q16', 'q84', 'q025', 'q975')):
+    """
+    Compare estimator precision across samplers and sample sizes.
+
+    Parameters
+    ----------
+    estimator : callable
+        estimator(n_samples, sampler, rng) -> summary dict of estimates
+    n_values : list of int
+        Sample sizes to test (powers of two suit Sobol)
+    n_repeats : int
+        Independent replications (fresh scrambles) per configuration
+    reference : dict, optional
+        Reference summary; defaults to an independent Sobol run with
+        reference_samples points
+    reference_samples : int
+        Size of the default reference run
+    samplers : tuple of str
+        Samplers to compare
+    seed : int
+        Seed for the replication generators
+    speedup_keys : tuple of str
+        Summary keys averaged in the speedup column
+
+    Returns
+    -------
+    pd.DataFrame
+        RMSE of every summary key per (sampler, n_samples), plus the
+        'speedup_vs_mc' column: plain-MC RMSE² / sampler RMSE² averaged over
+        speedup_keys, i.e. the sample-size reduction at equal precision
+    """
+    reference_seed, *seeds = np.random.SeedSequence(seed).spawn(n_repeats + 1)
+    estimates = {}
+    for sampler in samplers:
+        for n in n_values:
+            estimates[sampler, n] = pd.DataFrame([
+                estimator(n, sampler, np.random.default_rng(s)) for s in seeds
+            ])
+
+    if reference is None:
+        reference = estimator(reference_samples, 'sobol', np.random.default_rng(reference_seed))
+
+    rows = []
+    for (sampler, n), frame in estimates.items():
+        row = {'sampler': sampler, 'n_samples': n}
+        for key in frame.columns:
+            row[f'rmse_{key}'] = np.sqrt(np.mean((frame[key] - reference[key])**2))
+        rows.append(row)
+    report = pd.DataFrame(rows)
+
+    rmse_columns = [f'rmse_{key}' for key in speedup_keys]
+    if 'mc' in samplers:
+        mc_rmse = report[report['sampler'] == 'mc'].set_index('n_samples')[rmse_columns]
+        ratios = []
+        for _, row in report.iterrows():
+            mse_ratio = (mc_rmse.loc[row['n_samples']]**2) / (row[rmse_columns].astype(float)**2)
+            ratios.append(mse_ratio.mean())
+        report['speedup_vs_mc'] = ratios
+
+    return report
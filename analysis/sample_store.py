@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped On-Disk Sample Store
+==================================
+
+Persists Monte Carlo and posterior draws (σ_sys,corr samples, hyper-prior
+draws) so that figures, validation and tables can re-analyse them without
+re-sampling.
+
+Layout for a store at <path>:
+    <path>.npy   standard NumPy array, written through np.memmap
+    <path>.json  header: seed, config, config_hash, dtype, sample shape,
+                 count and capacity
+
+Appends write straight into a preallocated memory map that grows
+geometrically, so the amortized cost is one extra copy per sample.
+close() trims the array to the samples actually written, leaving a plain
+.npy file that np.load can also read. Readers open it zero-copy with
+np.load(mmap_mode='r'), so 10⁸-sample arrays can be histogrammed or
+re-summarized chunk by chunk.
+
+Author: Distance Ladder Systematics Analysis
+Date: 2025-11-24
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from streaming_statistics import StreamingSummary
+
+DEFAULT_CAPACITY = 1_048_576
+
+
+def config_hash(config):
+    """
+    Stable SHA-256 hash of a configuration dict.
+
+    Parameters
+    ----------
+    config : dict
+        JSON-serializable configuration (non-serializable values are
+        converted with str)
+
+    Returns
+    -------
+    str
+        Hex digest
+    """
+    encoded = json.dumps(config, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _store_paths(path):
+    path = Path(path)
+    if path.suffix in ('.npy', '.json'):
+        path = path.with_suffix('')
+    return path.with_suffix('.npy'), path.with_suffix('.json')
+
+
+class SampleStore:
+    """
+    Append-only .npy sample file with a JSON metadata header.
+
+    Usage:
+        with SampleStore(DATA_DIR / 'mc_samples', seed=2025, config=cfg) as store:
+            store.append(block)
+        samples, header = open_samples(DATA_DIR / 'mc_samples')
+    """
+
+    def __init__(self, path, seed=None, config=None, dtype=np.float64, sample_shape=(),
+                 capacity=DEFAULT_CAPACITY):
+        """
+        Create (or overwrite) a store.
+
+        Parameters
+        ----------
+        path : str or Path
+            Store path without suffix (.npy/.json are added)
+        seed : int, optional
+            Root seed used to generate the samples
+        config : dict, optional
+            Run configuration recorded in the header and hashed
+        dtype : dtype
+            Sample dtype
+        sample_shape : tuple
+            Shape of one sample (() for scalar draws)
+        capacity : int
+            Initial number of preallocated samples
+        """
+        self.array_path, self.header_path = _store_paths(path)
+        self.array_path.parent.mkdir(parents=True, exist_ok=True)
+        self.seed = seed
+        self.config = config or {}
+        self.dtype = np.dtype(dtype)
+        self.sample_shape = tuple(sample_shape)
+        self.count = 0
+        self._array = open_memmap(self.array_path, mode='w+', dtype=self.dtype,
+                                  shape=(max(1, capacity),) + self.sample_shape)
+        self._write_header()
+
+    @property
+    def capacity(self):
+        return self._array.shape[0]
+
+    def _write_header(self):
+        header = {
+            'seed': self.seed,
+            'config': self.config,
+            'config_hash': config_hash(self.config),
+            'dtype': self.dtype.str,
+            'sample_shape': list(self.sample_shape),
+            'count': self.count,
+            'capacity': self.capacity
+        }
+        with open(self.header_path, 'w') as f:
+            json.dump(header, f, indent=2, default=str)
+
+    def _resize(self, capacity):
+        """Copy the written samples into a new memory map of the given capacity."""
+        tmp_path = self.array_path.with_suffix('.tmp.npy')
+        resized = open_memmap(tmp_path, mode='w+', dtype=self.dtype,
+                              shape=(capacity,) + self.sample_shape)
+        resized[:self.count] = self._array[:self.count]
+        resized.flush()
+        del self._array
+        os.replace(tmp_path, self.array_path)
+        self._array = resized
+
+    def append(self, samples):
+        """
+        Append a block of samples.
+
+        Parameters
+        ----------
+        samples : array
+            (n, *sample_shape) block
+        """
+        samples = np.asarray(samples, dtype=self.dtype).reshape((-1,) + self.sample_shape)
+        n_new = samples.shape[0]
+        if self.count + n_new > self.capacity:
+            self._resize(max(2 * self.capacity, self.count + n_new))
+        self._array[self.count:self.count + n_new] = samples
+        self.count += n_new
+
+    def flush(self):
+        """Flush samples to disk and update the header."""
+        self._array.flush()
+        self._write_header()
+
+    def close(self):
+        """Trim to the written samples and finalize the header."""
+        if self._array is None:
+            return
+        if self.count != self.capacity:
+            self._resize(max(1, self.count))
+        self.flush()
+        self._array = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_header(path):
+    """
+    Read the JSON header of a sample store.
+
+    Returns
+    -------
+    dict
+        seed, config, config_hash, dtype, sample_shape, count, capacity
+    """
+    _, header_path = _store_paths(path)
+    with open(header_path) as f:
+        return json.load(f)
+
+
+def open_samples(path, config=None):
+    """
+    Open stored samples zero-copy.
+
+    Parameters
+    ----------
+    path : str or Path
+        Store path (with or without suffix)
+    config : dict, optional
+        If given, raise ValueError unless it hashes to the stored
+        config_hash (guards against re-analysing stale samples)
+
+    Returns
+    -------
+    np.memmap
+        Read-only (count, *sample_shape) view of the samples
+    dict
+        Header
+    """
+    array_path, _ = _store_paths(path)
+    header = read_header(path)
+    if config is not None and config_hash(config) != header['config_hash']:
+        raise ValueError(f"Stored samples in {array_path} were generated with a different config")
+    samples = np.load(array_path, mmap_mode='r')
+    return samples[:header['count']], header
+
+
+def iter_chunks(samples, chunk_size=DEFAULT_CAPACITY):
+    """
+    Iterate over a (memory-mapped) sample array in fixed-size blocks.
+
+    Yields
+    ------
+    ndarray
+        In-memory copy of each block
+    """
+    for start in range(0, len(samples), chunk_size):
+        yield np.asarray(samples[start:start + chunk_size])
+
+
+def summarize_samples(path, chunk_size=DEFAULT_CAPACITY, compression=300):
+    """
+    Re-summarize stored scalar samples without loading them into memory.
+
+    Returns
+    -------
+    dict
+        Same keys as the σ_sys,corr Monte Carlo summaries
+    """
+    samples, _ = open_samples(path)
+    accumulator = StreamingSummary(compression)
+    for block in iter_chunks(samples, chunk_size):
+        accumulator.update(block)
+    return accumulator.summary()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Streaming Summary Statistics for Monte Carlo Propagation
+========================================================
+
+Constant-memory accumulators for σ_sys,corr posteriors:
+- Running mean/variance (Chan et al. parallel update)
+- Mergeable t-digest quantile sketch (Dunning & Ertl 2019, k₁ scale)
+
+Samples are consumed in fixed-size blocks, so 10⁸-sample runs never hold
+more than one block in memory, and sketches from independent shards can be
+merged into a single posterior summary.
+
+References:
+    - Chan, Golub & LeVeque 1979 (pairwise variance updates)
+    - Dunning & Ertl 2019, "Computing Extremely Accurate Quantiles Using t-Digests"
+
+Author: Distance Ladder Systematics Analysis
+Date: 2025-11-20
+"""
+
+import numpy as np
+
+# Percentiles reported in every σ_sys,corr summary
+SUMMARY_PERCENTILES = {
+    'q025': 2.5,
+    'q16': 16.0,
+    'median': 50.0,
+    'q84': 84.0,
+    'q975': 97.5
+}
+
+
+class RunningMoments:
+    """
+    Running count, mean and sum of squared deviations.
+
+    Blocks are folded in with the pairwise update of Chan et al., which is
+    numerically stable and associative, so shards can be merged in any
+    grouping.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _combine(self, count, mean, m2):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+
+    def update(self, values):
+        """
+        Fold a block of samples into the running moments.
+
+        Parameters
+        ----------
+        values : array
+            Block of samples
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        mean = values.mean()
+        self._combine(values.size, mean, np.sum((values - mean)**2))
+
+    def merge(self, other):
+        """
+        Merge moments accumulated on another shard.
+
+        Parameters
+        ----------
+        other : RunningMoments
+            Moments from an independent shard
+        """
+        self._combine(other.count, other.mean, other.m2)
+
+    @property
+    def std(self):
+        """Population standard deviation (matches np.std)."""
+        if self.count == 0:
+            return np.nan
+        return np.sqrt(self.m2 / self.count)
+
+
+class TDigest:
+    """
+    Mergeable t-digest quantile sketch.
+
+    Centroids are compressed with the k₁ scale function
+    k(q) = δ/(2π)·arcsin(2q - 1), which keeps centroids small in the tails
+    where the 2.5%/97.5% quantiles live. The number of centroids is bounded
+    by ~δ regardless of how many samples are added.
+    """
+
+    def __init__(self, compression=300):
+        """
+        Parameters
+        ----------
+        compression : float
+            Scale parameter δ (larger = more centroids, higher accuracy)
+        """
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def total_weight(self):
+        return self.weights.sum()
+
+    def _k_scale(self, q):
+        return self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means = means[order]
+        weights = weights[order]
+
+        # Group consecutive points whose left-edge quantile falls in the same
+        # unit interval of the scale function
+        cum_weights = np.cumsum(weights)
+        q_left = (cum_weights - weights) / cum_weights[-1]
+        groups = np.floor(self._k_scale(q_left) - self._k_scale(0.0)).astype(np.int64)
+        _, groups = np.unique(groups, return_inverse=True)
+
+        merged_weights = np.bincount(groups, weights=weights)
+        merged_means = np.bincount(groups, weights=weights * means) / merged_weights
+
+        self.means = merged_means
+        self.weights = merged_weights
+
+    def update(self, values):
+        """
+        Add a block of samples to the sketch.
+
+        Parameters
+        ----------
+        values : array
+            Block of samples
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(values.size)]))
+
+    def merge(self, other):
+        """
+        Merge the centroids of another sketch into this one.
+
+        Parameters
+        ----------
+        other : TDigest
+            Sketch built on an independent shard
+        """
+        if other.weights.size == 0:
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+
+    def quantile(self, q):
+        """
+        Estimate quantile(s) by interpolating between centroid centres.
+
+        Parameters
+        ----------
+        q : float or array
+            Quantile level(s) in [0, 1]
+
+        Returns
+        -------
+        float or ndarray
+            Estimated quantile(s)
+        """
+        if self.weights.size == 0:
+            raise ValueError("Cannot compute quantiles of an empty digest")
+        total = self.total_weight
+        centres = np.cumsum(self.weights) - 0.5 * self.weights
+        xp = np.concatenate([[0.0], centres, [total]])
+        fp = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(np.asarray(q) * total, xp, fp)
+
+
+class StreamingSummary:
+    """
+    Constant-memory replacement for summarize-after-sampling.
+
+    Combines RunningMoments and TDigest and produces the same summary dict
+    (mean, median, std, q16, q84, q025, q975) as the in-memory path.
+    """
+
+    def __init__(self, compression=300):
+        self.moments = RunningMoments()
+        self.digest = TDigest(compression)
+
+    @property
+    def count(self):
+        return self.moments.count
+
+    def update(self, values):
+        """Fold a block of samples into moments and sketch."""
+        self.moments.update(values)
+        self.digest.update(values)
+
+    def merge(self, other):
+        """Merge a StreamingSummary accumulated on another shard."""
+        self.moments.merge(other.moments)
+        self.digest.merge(other.digest)
+
+    def summary(self):
+        """
+        Posterior summary in the format used by the Monte Carlo scripts.
+
+        Returns
+        -------
+        dict
+            Mean, median, std and 68%/95% interval bounds
+        """
+        keys = list(SUMMARY_PERCENTILES)
+        levels = np.array([SUMMARY_PERCENTILES[k] for k in keys]) / 100.0
+        quantiles = dict(zip(keys, self.digest.quantile(levels)))
+        return {
+            'mean': self.moments.mean,
+            'median': quantiles['median'],
+            'std': self.moments.std,
+            'q16': quantiles['q16'],
+            'q84': quantiles['q84'],
+            'q025': quantiles['q025'],
+            'q975': quantiles['q975']
+        }